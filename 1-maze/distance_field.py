@@ -0,0 +1,123 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 1:   maze distance fields
+#                   -----------------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# One BFS from a target (or a set of targets) labels every cell of the maze with
+# its distance and the direction of its next step towards the nearest target.
+# Any number of start positions can then be answered by walking those
+# directions, in time proportional to the path length. The BFS is `bfs_tree`'s,
+# over flat cell indices, started from a virtual cell next to all targets; its
+# tree is then flattened into arrays.
+
+import os
+import sys
+from array import array
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from bfslib import bfs_tree
+
+
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+UNREACHABLE = -1
+NO_DIRECTION = 255
+# Flat index of a virtual cell next to every target, which the search starts from
+SOURCE = -1
+
+
+class DistanceField:
+    """
+    Distances and next-step directions towards a set of targets, over a flattened maze grid
+    """
+    def __init__(self, maze, targets):
+        """
+        :param maze: Nested list of booleans, True denoting free cells
+        :param targets: Iterable of (row, col) target positions
+        """
+        self.n_rows = n_rows = len(maze)
+        self.n_cols = n_cols = len(maze[0])
+        self.targets = frozenset(targets)
+        # Flat index of a cell is row * n_cols + col
+        self.distances = distances = array('i', [UNREACHABLE]) * (n_rows * n_cols)
+        # Index into DIRECTIONS of the step that leads from each cell towards the nearest target
+        self.directions = directions = bytearray([NO_DIRECTION]) * (n_rows * n_cols)
+
+        def neighbors(idx):
+            if idx == SOURCE:
+                return ((None, row * n_cols + col) for row, col in self.targets)
+
+            row, col = divmod(idx, n_cols)
+            return (
+                (dir_idx, (row - drow) * n_cols + col - dcol)
+                for dir_idx, (drow, dcol) in enumerate(DIRECTIONS)
+                if 0 <= row - drow < n_rows and 0 <= col - dcol < n_cols and maze[row - drow][col - dcol]
+            )
+
+        # Parents come in nondecreasing order of distance, so a cell's parent is always labelled before it
+        parents = bfs_tree(SOURCE, neighbors)
+        del parents[SOURCE]
+        for idx, (parent, dir_idx, _) in parents.items():
+            if parent == SOURCE:
+                distances[idx] = 0
+            else:
+                distances[idx] = distances[parent] + 1
+                directions[idx] = dir_idx
+
+    def distance(self, pos):
+        """
+        :param pos: (row, col) position
+        :return: Distance from `pos` to the nearest target, or `UNREACHABLE`
+        """
+        return self.distances[pos[0] * self.n_cols + pos[1]]
+
+    def path_from(self, start_pos):
+        """
+        Shortest path from `start_pos` to the nearest target
+        :param start_pos: (row, col) position
+        :return: List of (row, col) positions starting with `start_pos` and ending in a target,
+                 or an empty list if no target is reachable
+        """
+        row, col = start_pos
+        if self.distances[row * self.n_cols + col] == UNREACHABLE:
+            return []
+
+        path = [start_pos]
+        while (row, col) not in self.targets:
+            drow, dcol = DIRECTIONS[self.directions[row * self.n_cols + col]]
+            row += drow
+            col += dcol
+            path.append((row, col))
+
+        return path
+
+
+class MazeFields:
+    """
+    Cache of distance fields over a single maze, keyed by target set
+    """
+    def __init__(self, maze):
+        """
+        :param maze: Nested list of booleans, True denoting free cells. Must not change afterwards.
+        """
+        self.maze = maze
+        self._fields = {}
+
+    def field(self, targets):
+        """
+        :param targets: Iterable of (row, col) target positions
+        :return: `DistanceField` towards `targets`, computed on first request
+        """
+        targets = frozenset(targets)
+        if targets not in self._fields:
+            self._fields[targets] = DistanceField(self.maze, targets)
+
+        return self._fields[targets]
+
+    def find_path(self, start_pos, end_pos):
+        """
+        Same contract as `main.find_path`, answered from the cached field of `end_pos`
+        """
+        return self.field([end_pos]).path_from(start_pos)
@@ -0,0 +1,170 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 1:   junction graph
+#                   ----------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Contracts a maze into a graph of its junctions (dead ends and forks, i.e.
+# every free cell without exactly two free neighbors), connected by the
+# corridors between them, weighted by corridor length. Searching the junction
+# graph skips walking corridors cell by cell; the chosen corridors are walked
+# again only to expand the final path back into cells.
+#
+# Only one-cell-wide corridors are contracted. Cells of wider corridors have
+# more than two free neighbors and all stay junctions, so this falls well short
+# of an order of magnitude fewer nodes on the repo's mazes, which draw vertical
+# corridors two cells wide: mazes/5.txt goes from 3171 free cells to 1947
+# junctions, mazes/4.txt from 2221 to 1378. A one-cell-wide redrawing of
+# mazes/5.txt goes from 1804 cells to 504 junctions.
+
+from heapq import heappush, heappop
+
+
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+
+class JunctionGraph:
+    """
+    Junctions of a maze and the corridors connecting them
+    """
+    def __init__(self, maze):
+        """
+        :param maze: Nested list of booleans, True denoting free cells. Must not change afterwards.
+        """
+        self.maze = maze
+        self.n_rows = len(maze)
+        self.n_cols = len(maze[0])
+        self.nodes = {
+            (row, col)
+            for row in range(self.n_rows) for col in range(self.n_cols)
+            if maze[row][col] and len(self._free_neighbors((row, col))) != 2
+        }
+        # Per junction, list of (other junction, corridor length, index into DIRECTIONS of first step)
+        self.edges = {}
+        for node in self.nodes:
+            node_edges = self.edges[node] = []
+            for dir_idx, nxt in self._free_neighbors(node):
+                cells = self._walk(node, nxt)
+                if cells is not None and cells[-1] != node:
+                    node_edges.append((cells[-1], len(cells), dir_idx))
+
+    def _free_neighbors(self, pos):
+        row, col = pos
+        return [
+            (dir_idx, (row + drow, col + dcol))
+            for dir_idx, (drow, dcol) in enumerate(DIRECTIONS)
+            if 0 <= row + drow < self.n_rows and 0 <= col + dcol < self.n_cols and self.maze[row + drow][col + dcol]
+        ]
+
+    def _walk(self, origin, pos, stop=None):
+        """
+        Follows a corridor from `origin` through its neighbor `pos` up to the next junction
+        :param stop: Optional cell to stop at, even if it's inside the corridor
+        :return: List of cells walked (excluding `origin`, ending at the junction / `stop`),
+                 or `None` if the corridor loops back to `origin` without meeting a junction
+        """
+        cells = [pos]
+        prev = origin
+        while pos not in self.nodes and pos != stop:
+            nxt = next(cell for _, cell in self._free_neighbors(pos) if cell != prev)
+            if nxt == origin:
+                return None
+
+            prev, pos = pos, nxt
+            cells.append(pos)
+
+        return cells
+
+    def _attachments(self, pos, other):
+        """
+        Connects an arbitrary free cell to the graph
+        :param other: Cell to look out for along the way
+        :return: List of (junction, cells walked from `pos` to it) pairs and the cells walked from `pos`
+                 to `other` if it lies on the same corridor (otherwise `None`)
+        """
+        if pos in self.nodes:
+            return [(pos, [])], [] if pos == other else None
+
+        attachments = []
+        direct = None
+        for _, nxt in self._free_neighbors(pos):
+            cells = self._walk(pos, nxt, stop=other)
+            if cells is None:
+                continue
+            if cells[-1] == other:
+                if direct is None or len(cells) < len(direct):
+                    direct = cells
+                if other not in self.nodes:
+                    continue
+
+            attachments.append((cells[-1], cells))
+
+        return attachments, direct
+
+    def find_path(self, start_pos, end_pos):
+        """
+        Same contract as `main.find_path`, searching over junctions
+        """
+        if start_pos == end_pos:
+            return [start_pos]
+
+        starts, direct = self._attachments(start_pos, end_pos)
+        ends, _ = self._attachments(end_pos, None)
+        # Shortest corridor between each attached junction and the start / end
+        start_cells = {}
+        for node, cells in starts:
+            if node not in start_cells or len(cells) < len(start_cells[node]):
+                start_cells[node] = cells
+        end_cells = {}
+        for node, cells in ends:
+            if node not in end_cells or len(cells) < len(end_cells[node]):
+                end_cells[node] = cells
+
+        # Dijkstra over junctions, parents hold (previous junction, direction of corridor taken from it)
+        distances = {}
+        parents = {}
+        queue = []
+        for node, cells in start_cells.items():
+            distances[node] = len(cells)
+            parents[node] = None
+            heappush(queue, (len(cells), node))
+
+        best = len(direct) if direct is not None else float('inf')
+        best_node = None
+        while queue:
+            distance, node = heappop(queue)
+            if distance > distances[node] or distance >= best:
+                continue
+            if node in end_cells and distance + len(end_cells[node]) < best:
+                best = distance + len(end_cells[node])
+                best_node = node
+
+            for nxt, length, dir_idx in self.edges[node]:
+                if distance + length < distances.get(nxt, float('inf')):
+                    distances[nxt] = distance + length
+                    parents[nxt] = (node, dir_idx)
+                    heappush(queue, (distance + length, nxt))
+
+        if best_node is None:
+            return [start_pos] + direct if direct is not None else []
+
+        # Expand junction chain back into cells
+        chain = []
+        node = best_node
+        while parents[node] is not None:
+            prev, dir_idx = parents[node]
+            drow, dcol = DIRECTIONS[dir_idx]
+            chain.append(self._walk(prev, (prev[0] + drow, prev[1] + dcol)))
+            node = prev
+
+        path = [start_pos] + start_cells[node]
+        for cells in reversed(chain):
+            path.extend(cells)
+
+        if end_cells[best_node]:
+            path.extend(reversed(end_cells[best_node][:-1]))
+            path.append(end_pos)
+
+        return path
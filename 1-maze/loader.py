@@ -0,0 +1,131 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 1:   compact maze loading
+#                   -----------------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Loaders for mazes too big to hold as nested lists of bools:
+#   - `stream_maze` reads a maze file line by line into a packed bit array
+#     (1 bit per cell), finding the start and end in the same pass
+#   - `MappedMaze` memory-maps a fixed-width maze file and reads cells straight
+#     from the file's bytes, without loading it at all
+# Both can be passed to `main.find_path` instead of the nested list.
+
+import mmap
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+FREE_CELLS = ' !@'
+START = '@'
+END = '!'
+_TO_BINARY = str.maketrans({ch: '1' if ch in FREE_CELLS else '0' for ch in map(chr, range(128))})
+# Per byte value, whether it denotes a free cell
+_FREE_BYTES = bytes(chr(ch) in FREE_CELLS for ch in range(256))
+
+
+class PackedMaze:
+    """
+    Maze packed 1 bit per cell: bit `col` of row `row` is bit `col % 8` of byte `row * stride + col // 8`
+    """
+    def __init__(self, n_rows, n_cols, bits, start_pos, end_pos):
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.stride = (n_cols + 7) // 8
+        self.bits = bits
+        self.start_pos = start_pos
+        self.end_pos = end_pos
+
+    def is_free(self, row, col):
+        """
+        :return: True if cell (row, col) is free
+        """
+        return bool(self.bits[row * self.stride + (col >> 3)] >> (col & 7) & 1)
+
+    def to_array(self):
+        """
+        :return: NumPy boolean array of free cells
+        """
+        packed = np.frombuffer(self.bits, dtype=np.uint8).reshape(self.n_rows, self.stride)
+        return np.unpackbits(packed, axis=1, bitorder='little')[:, :self.n_cols].astype(bool)
+
+
+def stream_maze(path):
+    """
+    Loads a maze file into a `PackedMaze`, one line at a time. Empty lines are skipped,
+    and rows shorter than the first one are padded with walls.
+    :param path: Maze file path
+    :return: `PackedMaze`
+    """
+    bits = bytearray()
+    n_rows = n_cols = 0
+    start_pos = end_pos = None
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            if n_rows == 0:
+                n_cols = len(line)
+            line = line[:n_cols]
+
+            if start_pos is None and START in line:
+                start_pos = (n_rows, line.index(START))
+            if end_pos is None and END in line:
+                end_pos = (n_rows, line.index(END))
+
+            # Reversed so that column 0 lands in the least significant bit
+            bits += int('0' + line.translate(_TO_BINARY)[::-1], 2).to_bytes((n_cols + 7) // 8, 'little')
+            n_rows += 1
+
+    return PackedMaze(n_rows, n_cols, bits, start_pos, end_pos)
+
+
+class MappedMaze:
+    """
+    Maze read directly from a memory-mapped, fixed-width maze file
+    """
+    def __init__(self, path):
+        """
+        :param path: Maze file path. All lines must have the same length.
+        """
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.n_cols = self._mm.find(b'\n')
+        if self.n_cols == -1:
+            self.n_cols = len(self._mm)
+        self.line_width = self.n_cols + 1
+        # A trailing newline (or none at all) both make for whole rows
+        self.n_rows = (len(self._mm) + 1) // self.line_width
+        self.start_pos = self._find(START)
+        self.end_pos = self._find(END)
+
+    def _find(self, ch):
+        offset = self._mm.find(ch.encode())
+        if offset == -1:
+            return None
+
+        return divmod(offset, self.line_width)
+
+    def is_free(self, row, col):
+        """
+        :return: True if cell (row, col) is free
+        """
+        return bool(_FREE_BYTES[self._mm[row * self.line_width + col]])
+
+    def to_array(self):
+        """
+        :return: NumPy boolean array of free cells
+        """
+        raw = np.frombuffer(self._mm, dtype=np.uint8, count=self.n_rows * self.line_width - 1)
+        raw = np.append(raw, np.uint8(ord('\n'))).reshape(self.n_rows, self.line_width)[:, :self.n_cols]
+        return np.frombuffer(_FREE_BYTES, dtype=bool)[raw]
+
+    def close(self):
+        self._mm.close()
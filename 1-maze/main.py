@@ -6,20 +6,74 @@
 ##############################################################################
 ##############################################################################
 
-def find_path(maze, start_pos, end_pos):
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from bfslib import bfs
+from bfslib.grid import grid_path
+from junctions import JunctionGraph
+
+
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+# Per maze id, (maze, its `JunctionGraph`), built on the first 'junctions' search of the maze.
+# Mazes searched this way must not change afterwards.
+JUNCTION_GRAPHS = {}
+
+
+def find_path(maze, start_pos, end_pos, method='bfs'):
     # Params:
     #   maze:       nested list of booleans, where each row represents a row
     #               in the maze, and each bool denotes whether the corresponding
-    #               cell is free (True) or occupied by a wall (False)
+    #               cell is free (True) or occupied by a wall (False).
+    #               Alternatively a compact `loader.PackedMaze` / `loader.MappedMaze`
+    #               (not supported by the 'junctions' method)
     #   start_pos:  (int, int) tuple denoting the initial (row, column) position
     #               of the player
     #   end_pos:    (int, int) tuple denoting the objective (row, column)
     #               position
+    #   method:     'bfs' for plain cell-by-cell BFS,
+    #               'vectorized' to expand whole BFS layers at once with NumPy
+    #               arrays (much faster on very large mazes), or
+    #               'junctions' to search a graph of junctions connected by
+    #               corridors (much fewer nodes on mazes with one-cell-wide
+    #               corridors, its graph is built once per maze)
     #
     # Return value:     list of (int, int) tuples denoting (row, column)
     #                   positions of the shortest path, starting with
     #                   start_pos and ending in end_pos
-    raise NotImplementedError()
+    compact = not isinstance(maze, list)
+    if method == 'vectorized':
+        return grid_path(maze.to_array() if compact else maze, start_pos, end_pos)
+    if method == 'junctions':
+        # The maze is kept along with its graph, so that its id can't be reused by another maze
+        if id(maze) not in JUNCTION_GRAPHS:
+            JUNCTION_GRAPHS[id(maze)] = (maze, JunctionGraph(maze))
+        return JUNCTION_GRAPHS[id(maze)][1].find_path(start_pos, end_pos)
+    if method != 'bfs':
+        raise ValueError(f"Unknown search method: {method}")
+
+    if compact:
+        n_rows, n_cols, is_free = maze.n_rows, maze.n_cols, maze.is_free
+    else:
+        n_rows, n_cols = len(maze), len(maze[0])
+
+        def is_free(row, col):
+            return maze[row][col]
+
+    def neighbors(pos):
+        row, col = pos
+        for drow, dcol in DIRECTIONS:
+            new_row = row + drow
+            new_col = col + dcol
+            if 0 <= new_row < n_rows and 0 <= new_col < n_cols and is_free(new_row, new_col):
+                yield None, (new_row, new_col)
+
+    steps = bfs(start_pos, neighbors, lambda pos: pos == end_pos)
+    if steps is None:
+        return []
+
+    return [start_pos] + [pos for _, pos in steps]
 
 
 ##############################################################################
@@ -0,0 +1,124 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 2:   game rules
+#                   ------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# The snake's movement, growth, crash and food placement rules, free of any
+# rendering, shared by the pygame loop in main.py and headless simulations.
+#
+# Every rule runs in constant time however long the snake gets: the body is a
+# deque of cells (head appended, tail popped), an occupancy bitmap answers
+# collisions, and food is drawn uniformly from an array of the free cells,
+# kept up to date by swap-removing cells the snake enters.
+
+import random
+from collections import deque
+
+
+# Crash causes
+WALL = 'wall'
+BODY = 'body'
+
+
+class SnakeGame:
+    """
+    State of a single game: the snake's body and the food
+    """
+    def __init__(self, n_cells, directions, rng=random):
+        """
+        :param n_cells: Number of cells per row / column in the arena grid
+        :param directions: List of (drow, dcol) steps that moves refer to by index
+        :param rng: Random number generator for food placement
+        """
+        self.n_cells = n_cells
+        self.directions = directions
+        self.rng = rng
+        # (row, col) cells, tail first
+        self.body = deque()
+        # Per flat index (row * n_cells + col), whether the cell is occupied
+        self.occupied = bytearray(n_cells * n_cells)
+        # Free flat indices in arbitrary order, and where each one sits in that array
+        self.free = list(range(n_cells * n_cells))
+        self.free_slots = list(range(n_cells * n_cells))
+        self.eaten = False
+        self.shifted = False
+        for col in range(n_cells // 2 - 2, n_cells // 2 + 1):
+            self._occupy((n_cells // 2, col))
+
+        self.food_pos = self._gen_food_pos()
+
+    @property
+    def snake(self):
+        """
+        List of (row, col) snake cells, tail first and head last, as the planners expect it.
+        Between `advance` and `move` the head appears twice. Takes time linear in the snake's length.
+        """
+        snake = list(self.body)
+        if self.shifted:
+            snake.append(snake[-1])
+
+        return snake
+
+    def _occupy(self, pos):
+        idx = pos[0] * self.n_cells + pos[1]
+        self.occupied[idx] = 1
+        # Swap-remove from the free array
+        slot = self.free_slots[idx]
+        last = self.free.pop()
+        if last != idx:
+            self.free[slot] = last
+            self.free_slots[last] = slot
+
+        self.body.append(pos)
+
+    def _vacate_tail(self):
+        row, col = self.body.popleft()
+        idx = row * self.n_cells + col
+        self.occupied[idx] = 0
+        self.free_slots[idx] = len(self.free)
+        self.free.append(idx)
+
+    def _gen_food_pos(self):
+        """
+        :return: Uniformly random (row, col) position off the snake, or `None` if the snake fills the arena
+        """
+        if not self.free:
+            return None
+
+        return divmod(self.free[self.rng.randrange(len(self.free))], self.n_cells)
+
+    def advance(self):
+        """
+        Moves the tail for the coming tick, unless the snake has just eaten and grows instead
+        """
+        if self.eaten:
+            self.eaten = False
+        else:
+            self._vacate_tail()
+
+        self.shifted = True
+
+    def move(self, dir_idx):
+        """
+        Moves the head one step, eating the food if it's there
+        :param dir_idx: Index into the directions list
+        :return: Crash cause (`WALL` or `BODY`), or `None` if the snake survived
+        """
+        self.shifted = False
+        drow, dcol = self.directions[dir_idx]
+        row, col = self.body[-1]
+        head = (row + drow, col + dcol)
+        if not (0 <= head[0] < self.n_cells and 0 <= head[1] < self.n_cells):
+            return WALL
+        if self.occupied[head[0] * self.n_cells + head[1]]:
+            return BODY
+
+        self._occupy(head)
+        if head == self.food_pos:
+            self.eaten = True
+            self.food_pos = self._gen_food_pos()
+
+        return None
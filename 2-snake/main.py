@@ -6,30 +6,58 @@
 ##############################################################################
 ##############################################################################
 
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from bfslib import bfs
+
+
 N_CELLS = 32  # Number of cells per row / column in the arena grid
 DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
 
 
-def find_directions(snake, food_pos):
+def find_directions(snake, food_pos, planner=None):
     # Params:
     #   snake:      list of (int, int), denoting (row, column) positions
     #               of snake cells, with index 0 representing the tail and the
     #               last element representing the head
     #   food_pos:   (int, int) tuple denoting the (row, column) position of
     #               the snake's tasty snack
+    #   planner:    optional planner object to delegate to, either
+    #               planner.SnakePlanner, which repairs its previous plan
+    #               instead of searching from scratch (cheap enough to replan
+    #               every tick), or planner.TimedPlanner, which knows the
+    #               tail vacates cells as the snake moves
     #
     # Return value:     list of integers denoting the direction indices
     #                   (referring to the DIRECTION const list) for each step
     #                   to be taken by the snake's head until arriving at
     #                   food_pos
-    raise NotImplementedError()
+    if planner is not None:
+        return planner.plan(snake, food_pos)
+
+    body = set(snake)
+
+    def neighbors(pos):
+        row, col = pos
+        for dir_idx, (drow, dcol) in enumerate(DIRECTIONS):
+            new_pos = (row + drow, col + dcol)
+            if 0 <= new_pos[0] < N_CELLS and 0 <= new_pos[1] < N_CELLS and new_pos not in body:
+                yield dir_idx, new_pos
+
+    steps = bfs(snake[-1], neighbors, lambda pos: pos == food_pos)
+    if steps is None:
+        return []
+
+    return [dir_idx for dir_idx, _ in steps]
 
 
 ##############################################################################
 ########################    behind-the-scenes code    ########################
 ##############################################################################
-import random
-import pygame
+from game import SnakeGame
+from planner import TimedPlanner
 
 
 FPS = 60
@@ -40,6 +68,9 @@ FOOD_COLOR = '#315659'
 
 
 def main():
+    # Imported here so that the solver above (and headless simulations) don't need pygame
+    import pygame
+
     pygame.init()
     clock = pygame.time.Clock()
 
@@ -55,10 +86,8 @@ def main():
     pygame.draw.rect(background, '#BCAB79',
                      (arena_start_x, arena_start_y, ARENA_SIZE, ARENA_SIZE))
 
-    snake = [(N_CELLS // 2, N_CELLS // 2 - 2), (N_CELLS // 2, N_CELLS // 2 - 1), (N_CELLS // 2, N_CELLS // 2)]
-    eaten = False
-
-    food_row, food_col = gen_food_pos(snake)
+    game = SnakeGame(N_CELLS, DIRECTIONS)
+    planner = TimedPlanner(N_CELLS, DIRECTIONS)
     dirs = []
 
     running = True
@@ -68,11 +97,15 @@ def main():
                 raise KeyboardInterrupt()
 
         window_surface.blit(background, (0, 0))
-        for cell_row, cell_col in snake:
+        for cell_row, cell_col in game.snake:
             cell_x = arena_start_x + round(cell_col * cell_size)
             cell_y = arena_start_y + round(cell_row * cell_size)
             pygame.draw.rect(window_surface, SNAKE_COLOR, (cell_x, cell_y, round(cell_size), round(cell_size)))
 
+        if game.food_pos is None:
+            exit('Arena filled, well done!')
+
+        food_row, food_col = game.food_pos
         food_x = arena_start_x + round(cell_size * food_col)
         food_y = arena_start_y + round(cell_size * food_row)
         pygame.draw.rect(window_surface, FOOD_COLOR, (food_x, food_y, round(cell_size), round(cell_size)))
@@ -80,43 +113,16 @@ def main():
         pygame.display.update()
         clock.tick(FPS)
 
-        if eaten:
-            snake.insert(0, (0, 0))
-            eaten = False
-
-        for i in range(len(snake) - 1):
-            snake[i] = snake[i + 1]
-
+        game.advance()
         if len(dirs) == 0:
-            dirs = find_directions(snake, (food_row, food_col))
+            dirs = find_directions(game.snake, game.food_pos, planner)
 
         if len(dirs) == 0:
             exit('Empty direction queue')
 
-        dir_idx = dirs.pop(0)
-
-        snake[-1] = (snake[-1][0] + DIRECTIONS[dir_idx][0], snake[-1][1] + DIRECTIONS[dir_idx][1])
-        if (snake[-1][0] < 0
-                or snake[-1][1] < 0
-                or snake[-1][0] >= N_CELLS
-                or snake[-1][1] >= N_CELLS
-                or snake[-1] in snake[:-1]):
+        if game.move(dirs.pop(0)) is not None:
             exit('Fatal crash')
 
-        if (food_row, food_col) == snake[-1]:
-            eaten = True
-            food_row, food_col = gen_food_pos(snake)
-
-
-def gen_food_pos(snake):
-    food_row, food_col = snake[0]
-    while (food_row, food_col) in snake:
-        food_row = random.randint(0, N_CELLS - 1)
-        food_col = random.randint(0, N_CELLS - 1)
-
-    return food_row, food_col
-
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,231 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 2:   incremental planner
+#                   ----------------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Keeps a BFS distance field rooted at the food, with each free cell pointing
+# one step towards it, and repairs the field as the snake moves instead of
+# re-searching the arena:
+#   - a cell freed by the tail only lowers distances around it
+#   - a cell taken by the head invalidates just the cells whose route to the
+#     food ran through it, which are re-labelled from their valid neighbors
+# Replanning every tick then costs about as much as the change since the last
+# tick. The field is rebuilt from scratch only when the food moves.
+#
+# `TimedPlanner` instead searches from the head over arrival ticks, knowing the
+# body cell at index i is vacated once the tail has moved past it.
+
+import os
+import sys
+from collections import deque
+from heapq import heappush, heappop
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from bfslib import bfs
+
+
+INF = float('inf')
+
+
+def _neighbor_table(n_cells, directions):
+    """
+    :return: Per flat index (row * n_cells + col), list of (direction index, neighbor index) pairs
+    """
+    return [
+        [
+            (dir_idx, (row + drow) * n_cells + col + dcol)
+            for dir_idx, (drow, dcol) in enumerate(directions)
+            if 0 <= row + drow < n_cells and 0 <= col + dcol < n_cells
+        ]
+        for row in range(n_cells) for col in range(n_cells)
+    ]
+
+
+class SnakePlanner:
+    """
+    Incrementally repaired food-rooted distance field over the arena
+    """
+    def __init__(self, n_cells, directions):
+        """
+        :param n_cells: Number of cells per row / column in the arena grid
+        :param directions: List of (drow, dcol) steps, plans are given as indices into it
+        """
+        self.n_cells = n_cells
+        self.directions = directions
+        self.food_pos = None
+        self.body = set()
+        # Flat index of (row, col) is row * n_cells + col
+        self.dist = [INF] * (n_cells * n_cells)
+        # Index into `directions` of the step that leads from each cell towards the food
+        self.step = [-1] * (n_cells * n_cells)
+        self.blocked = bytearray(n_cells * n_cells)
+        self.neighbors = _neighbor_table(n_cells, directions)
+        # Index into `directions` of the opposite step
+        self.opposite = [directions.index((-drow, -dcol)) for drow, dcol in directions]
+
+    def plan(self, snake, food_pos):
+        """
+        Same contract as `main.find_directions`. Cheap to call every tick with the updated snake.
+        :param snake: List of (row, col) snake cells, tail first
+        :param food_pos: (row, col) of the food
+        :return: List of direction indices leading the head to the food (empty if there's no way)
+        """
+        n = self.n_cells
+        body = {row * n + col for row, col in snake}
+        if food_pos != self.food_pos:
+            self._rebuild(food_pos[0] * n + food_pos[1], body)
+        else:
+            freed = self.body - body
+            taken = body - self.body
+            for idx in freed:
+                self.blocked[idx] = 0
+            for idx in taken:
+                self._block(idx)
+            self._relabel(freed)
+
+        self.food_pos = food_pos
+        self.body = body
+        return self._descend(snake[-1][0] * n + snake[-1][1])
+
+    def _rebuild(self, food_idx, body):
+        self.dist = [INF] * len(self.dist)
+        self.step = [-1] * len(self.step)
+        self.blocked = bytearray(len(self.blocked))
+        for idx in body:
+            self.blocked[idx] = 1
+
+        dist, step, blocked, opposite = self.dist, self.step, self.blocked, self.opposite
+        dist[food_idx] = 0
+        frontier = deque([food_idx])
+        while frontier:
+            idx = frontier.popleft()
+            for dir_idx, nxt in self.neighbors[idx]:
+                if not blocked[nxt] and dist[nxt] == INF:
+                    dist[nxt] = dist[idx] + 1
+                    step[nxt] = opposite[dir_idx]
+                    frontier.append(nxt)
+
+    def _block(self, idx):
+        """
+        Marks a cell as occupied and invalidates the cells routed through it
+        """
+        dist, step, blocked = self.dist, self.step, self.blocked
+        blocked[idx] = 1
+        if dist[idx] == INF:
+            return
+
+        # Collect the subtree of cells whose route to the food passes through `idx`
+        subtree = [idx]
+        stack = [idx]
+        while stack:
+            curr = stack.pop()
+            for dir_idx, nxt in self.neighbors[curr]:
+                if dist[nxt] != INF and step[nxt] == self.opposite[dir_idx]:
+                    dist[nxt] = INF
+                    subtree.append(nxt)
+                    stack.append(nxt)
+
+        dist[idx] = INF
+        step[idx] = -1
+        self._relabel(subtree)
+
+    def _relabel(self, cells):
+        """
+        Re-derives distances of `cells` from their neighbors and propagates any improvement
+        """
+        dist, step, blocked = self.dist, self.step, self.blocked
+        queue = []
+        for idx in cells:
+            if blocked[idx]:
+                continue
+
+            for dir_idx, nxt in self.neighbors[idx]:
+                if not blocked[nxt] and dist[nxt] + 1 < dist[idx]:
+                    dist[idx] = dist[nxt] + 1
+                    step[idx] = dir_idx
+
+            if dist[idx] != INF:
+                heappush(queue, (dist[idx], idx))
+
+        while queue:
+            d, idx = heappop(queue)
+            if d > dist[idx]:
+                continue
+
+            for dir_idx, nxt in self.neighbors[idx]:
+                if not blocked[nxt] and d + 1 < dist[nxt]:
+                    dist[nxt] = d + 1
+                    step[nxt] = self.opposite[dir_idx]
+                    heappush(queue, (d + 1, nxt))
+
+    def _descend(self, head_idx):
+        best = None
+        for dir_idx, nxt in self.neighbors[head_idx]:
+            if not self.blocked[nxt] and self.dist[nxt] != INF and (best is None or self.dist[nxt] < self.dist[best[1]]):
+                best = (dir_idx, nxt)
+
+        if best is None:
+            return []
+
+        dir_idx, idx = best
+        dirs = [dir_idx]
+        while self.dist[idx] > 0:
+            dir_idx = self.step[idx]
+            dirs.append(dir_idx)
+            drow, dcol = self.directions[dir_idx]
+            idx += drow * self.n_cells + dcol
+
+        return dirs
+
+
+class TimedPlanner:
+    """
+    Breadth-first search over arrival ticks, treating the body as obstacles only until the tail leaves them
+    """
+    def __init__(self, n_cells, directions):
+        """
+        :param n_cells: Number of cells per row / column in the arena grid
+        :param directions: List of (drow, dcol) steps, plans are given as indices into it
+        """
+        self.n_cells = n_cells
+        self.neighbors = _neighbor_table(n_cells, directions)
+        # Per flat index, first tick at which the head may enter the cell (0 for cells off the body)
+        self.free_at = [0] * (n_cells * n_cells)
+
+    def plan(self, snake, food_pos):
+        """
+        Same contract as `main.find_directions`, expecting the body to have been shifted for the coming tick
+        (so that the head appears twice at the end of `snake`)
+        :param snake: List of (row, col) snake cells, tail first
+        :param food_pos: (row, col) of the food
+        :return: List of direction indices leading the head to the food (empty if there's no way)
+        """
+        n = self.n_cells
+        free_at = self.free_at
+        # Step t is preceded by t - 1 more shifts, after which only indices >= t - 1 are still in place,
+        # so the cell at index i may be entered from step i + 2 on
+        for i, (row, col) in enumerate(snake[:-1]):
+            free_at[row * n + col] = i + 2
+
+        def neighbors(state):
+            idx, tick = state
+            for dir_idx, nxt in self.neighbors[idx]:
+                if free_at[nxt] <= tick + 1:
+                    yield dir_idx, (nxt, tick + 1)
+
+        # States are deduplicated by cell alone (first arrival is the earliest), keeping the search linear in
+        # the arena size, at the cost of missing plans that would need to dawdle while the tail clears the way
+        food_idx = food_pos[0] * n + food_pos[1]
+        steps = bfs((snake[-1][0] * n + snake[-1][1], 0), neighbors, lambda state: state[0] == food_idx,
+                    key=lambda state: state[0])
+
+        for row, col in snake:
+            free_at[row * n + col] = 0
+
+        if steps is None:
+            return []
+
+        return [dir_idx for dir_idx, _ in steps]
@@ -0,0 +1,151 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 2:   headless simulation
+#                   ----------------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Plays seeded snake games without a window, under the same rules as main.py
+# (see game.py), spread over a process pool, and reports how far each solver
+# gets and how long it spends planning.
+#
+# Usage: python simulate.py [n_games] [solver] [max_ticks]
+
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from game import SnakeGame
+from main import N_CELLS, DIRECTIONS, find_directions
+from planner import SnakePlanner, TimedPlanner
+
+
+# Per solver name, (planner class or None for plain `find_directions`, whether to replan every tick)
+SOLVERS = {
+    'static': (None, False),
+    'incremental': (SnakePlanner, True),
+    'timed': (TimedPlanner, False),
+}
+MAX_TICKS = 100000
+
+# Crash causes other than the ones in game.py
+NO_PLAN = 'no plan'
+FILLED = 'filled'
+TIMEOUT = 'timeout'
+
+
+def play(seed, solver='timed', max_ticks=MAX_TICKS):
+    """
+    Plays a single game to its end
+    :param seed: Seed for food placement
+    :param solver: Key of `SOLVERS`
+    :param max_ticks: Number of ticks after which the game is called off
+    :return: Dict of the game's metrics
+    """
+    planner_class, replan = SOLVERS[solver]
+    planner = planner_class(N_CELLS, DIRECTIONS) if planner_class is not None else None
+    game = SnakeGame(N_CELLS, DIRECTIONS, random.Random(seed))
+    dirs = []
+    foods = 0
+    plan_calls = 0
+    plan_time = 0.
+    cause = TIMEOUT
+    tick = 0
+    while tick < max_ticks:
+        if game.food_pos is None:
+            cause = FILLED
+            break
+
+        game.advance()
+        if replan or len(dirs) == 0:
+            start_time = time.perf_counter()
+            dirs = find_directions(game.snake, game.food_pos, planner)
+            plan_time += time.perf_counter() - start_time
+            plan_calls += 1
+
+        if len(dirs) == 0:
+            cause = NO_PLAN
+            break
+
+        tick += 1
+        cause = game.move(dirs.pop(0))
+        if cause is not None:
+            break
+
+        cause = TIMEOUT
+        if game.eaten:
+            foods += 1
+
+    return {
+        'seed': seed,
+        'length': len(game.body),
+        'ticks': tick,
+        'foods': foods,
+        'steps_per_food': tick / foods if foods else None,
+        'plan_calls': plan_calls,
+        'plan_time': plan_time,
+        'cause': cause,
+    }
+
+
+def _play(args):
+    return play(*args)
+
+
+def simulate(seeds, solver='timed', max_ticks=MAX_TICKS, processes=None):
+    """
+    Plays a game per seed over a process pool
+    :param seeds: Iterable of seeds
+    :param solver: Key of `SOLVERS`
+    :param max_ticks: Number of ticks after which each game is called off
+    :param processes: Number of worker processes (defaults to the number of CPUs)
+    :return: List of per-game metrics dicts (see `play`), in seed order
+    """
+    with Pool(processes) as pool:
+        return pool.map(_play, [(seed, solver, max_ticks) for seed in seeds], chunksize=8)
+
+
+def summarize(results):
+    """
+    :param results: List of per-game metrics dicts
+    :return: Dict of aggregate metrics
+    """
+    lengths = [result['length'] for result in results]
+    steps_per_food = [result['steps_per_food'] for result in results if result['steps_per_food'] is not None]
+    plan_calls = sum(result['plan_calls'] for result in results)
+    return {
+        'games': len(results),
+        'mean_length': statistics.mean(lengths),
+        'median_length': statistics.median(lengths),
+        'max_length': max(lengths),
+        'mean_steps_per_food': statistics.mean(steps_per_food) if steps_per_food else None,
+        'mean_plan_ms': 1000 * sum(result['plan_time'] for result in results) / plan_calls if plan_calls else None,
+        'causes': Counter(result['cause'] for result in results),
+    }
+
+
+def main():
+    n_games = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    solver = sys.argv[2] if len(sys.argv) > 2 else 'timed'
+    max_ticks = int(sys.argv[3]) if len(sys.argv) > 3 else MAX_TICKS
+
+    start_time = time.perf_counter()
+    summary = summarize(simulate(range(n_games), solver, max_ticks))
+    elapsed = time.perf_counter() - start_time
+
+    print(f"Solver: {solver}, {summary['games']} games in {elapsed:.1f}s ({summary['games'] / elapsed:.1f} games/s)")
+    print(f"Length: mean {summary['mean_length']:.1f}, median {summary['median_length']}, "
+          f"max {summary['max_length']}")
+    if summary['mean_steps_per_food'] is not None:
+        print(f"Steps per food: {summary['mean_steps_per_food']:.1f}")
+    if summary['mean_plan_ms'] is not None:
+        print(f"Planning time per call: {summary['mean_plan_ms']:.3f}ms")
+    print("Game endings: " + ', '.join(f"{cause} {count}" for cause, count in summary['causes'].most_common()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 3:   any number of jugs
+#                   ---------------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Plans for any number of jugs, with capacities too large to search blindly:
+#   - A goal is reachable iff it fits in the largest jug and is a multiple of
+#     the gcd of all capacities (Bezout), which settles impossible cases
+#     without any search
+#   - With two jugs, the shortest plan is one of the two "pour cycles" (keep
+#     filling one jug into the other, emptying the other whenever it's full),
+#     so both are simulated side by side until one reaches the goal
+#   - With more jugs, small instances are searched breadth-first, visiting
+#     states only once up to swapping jugs of equal capacity. Instances too
+#     big for that fall back to the best two-jug plan over a pair of jugs
+#     that can reach the goal on its own, when there is one, and otherwise to
+#     measuring the goal in the largest jug by adding and removing the other
+#     jugs' full capacities, as many times as Bezout coefficients of the goal
+#     say. Amounts are taken modulo the largest jug's capacity: an addition
+#     that overflows it empties it and pours in the rest, and a removal of
+#     more than it holds refills it from the tap to top the other jug up.
+#     That always works for feasible goals. These plans aren't shortest, but
+#     their length is linear in the capacities rather than in their product.
+
+import math
+import os
+import sys
+from collections import namedtuple
+from enum import Enum
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from bfslib import bfs
+
+
+# States with more combinations of amounts than this aren't searched exhaustively
+MAX_SEARCH_STATES = 10 ** 6
+
+
+class Kind(Enum):
+    EMPTY = 1
+    FILL = 2
+    POUR = 3
+
+
+# `target` is the jug poured into (`None` unless pouring)
+JugAction = namedtuple('JugAction', 'kind jug target', defaults=(None,))
+
+
+def apply_jug_action(capacities, amounts, action):
+    """
+    :param capacities: Tuple of jug capacities
+    :param amounts: Tuple of current amounts in the jugs
+    :param action: `JugAction` to apply
+    :return: Tuple of amounts after applying `action`
+    """
+    amounts = list(amounts)
+    match action.kind:
+        case Kind.EMPTY:
+            amounts[action.jug] = 0
+        case Kind.FILL:
+            amounts[action.jug] = capacities[action.jug]
+        case Kind.POUR:
+            pour_amount = min(amounts[action.jug], capacities[action.target] - amounts[action.target])
+            amounts[action.jug] -= pour_amount
+            amounts[action.target] += pour_amount
+
+    return tuple(amounts)
+
+
+def is_feasible(capacities, goal):
+    """
+    :return: True if `goal` can be measured in any single jug
+    """
+    return goal == 0 or (goal <= max(capacities) and goal % math.gcd(*capacities) == 0)
+
+
+def _pour_cycle(capacities, src, dst):
+    """
+    Endlessly fills jug `src`, pours it into jug `dst` and empties `dst` whenever it's full
+    :return: Generator of (action, amount in `src`, amount in `dst`) after each action
+    """
+    fill = JugAction(Kind.FILL, src)
+    empty = JugAction(Kind.EMPTY, dst)
+    pour = JugAction(Kind.POUR, src, dst)
+    src_capacity = capacities[src]
+    dst_capacity = capacities[dst]
+    src_amount = dst_amount = 0
+    while True:
+        if src_amount == 0:
+            src_amount = src_capacity
+            yield fill, src_amount, dst_amount
+        elif dst_amount == dst_capacity:
+            dst_amount = 0
+            yield empty, src_amount, dst_amount
+        else:
+            pour_amount = min(src_amount, dst_capacity - dst_amount)
+            src_amount -= pour_amount
+            dst_amount += pour_amount
+            yield pour, src_amount, dst_amount
+
+
+def _first_cycle_to_goal(capacities, pairs, goal):
+    """
+    Runs the pour cycles of all given pairs of jugs side by side, so the work done is proportional to
+    the shortest plan found. At least one pair must be able to reach the goal on its own.
+    :param pairs: List of (jug, jug) index pairs
+    :return: List of `JugAction`s of the cycle that reached the goal first
+    """
+    cycles = []
+    for jug1, jug2 in pairs:
+        cycles += [_pour_cycle(capacities, jug1, jug2), _pour_cycle(capacities, jug2, jug1)]
+
+    plans = [[] for _ in cycles]
+    while True:
+        for cycle, cycle_plan in zip(cycles, plans):
+            action, src_amount, dst_amount = next(cycle)
+            cycle_plan.append(action)
+            if src_amount == goal or dst_amount == goal:
+                return cycle_plan
+
+
+def plan_two(capacities, goal):
+    """
+    Shortest plan for two jugs, in time linear in its length
+    :param capacities: (capacity 1, capacity 2)
+    :param goal: Desired amount in either jug
+    :return: List of `JugAction`s, or `None` if impossible
+    """
+    if not is_feasible(capacities, goal):
+        return None
+    if goal == 0:
+        return []
+
+    return _first_cycle_to_goal(capacities, [(0, 1)], goal)
+
+
+def _bezout(numbers):
+    """
+    :param numbers: Sequence of positive ints
+    :return: (gcd of `numbers`, list of coefficients such that sum(coefficient * number) == gcd)
+    """
+    gcd = numbers[0]
+    coefficients = [1]
+    for number in numbers[1:]:
+        # Extended Euclid over (gcd, number)
+        old_r, r, old_x, x, old_y, y = gcd, number, 1, 0, 0, 1
+        while r:
+            q = old_r // r
+            old_r, r = r, old_r - q * r
+            old_x, x = x, old_x - q * x
+            old_y, y = y, old_y - q * y
+
+        gcd = old_r
+        coefficients = [coefficient * old_x for coefficient in coefficients] + [old_y]
+
+    return gcd, coefficients
+
+
+def _accumulate(capacities, goal):
+    """
+    Measures `goal` in the largest jug by pouring the other jugs into it full, and pouring it into the other
+    jugs when empty (then emptying them), modulo its capacity
+    :return: List of `JugAction`s (the goal must be feasible)
+    """
+    target = max(range(len(capacities)), key=lambda jug: capacities[jug])
+    capacity = capacities[target]
+    if goal == capacity:
+        return [JugAction(Kind.FILL, target)]
+
+    helpers = [jug for jug in range(len(capacities)) if jug != target]
+    gcd, coefficients = _bezout([capacities[jug] for jug in helpers] + [capacity])
+    # Only counts modulo each helper's period (the number of its capacities that make a whole number of
+    # the target's) matter, take the smallest in absolute value
+    counts = {}
+    for jug, coefficient in zip(helpers, coefficients):
+        period = capacity // math.gcd(capacities[jug], capacity)
+        count = coefficient * (goal // gcd) % period
+        counts[jug] = count - period if 2 * count > period else count
+
+    amount = 0
+    plan = []
+    while amount != goal:
+        # Prefer pours that don't wrap around, they take two actions rather than four
+        adds = [jug for jug in helpers if counts[jug] > 0]
+        subs = [jug for jug in helpers if counts[jug] < 0]
+        jug = next((jug for jug in adds if amount + capacities[jug] <= capacity), None)
+        if jug is None:
+            jug = next((jug for jug in subs if amount >= capacities[jug]), None)
+        if jug is None:
+            jug = (adds or subs)[0]
+
+        jug_capacity = capacities[jug]
+        if counts[jug] > 0:
+            counts[jug] -= 1
+            plan += [JugAction(Kind.FILL, jug), JugAction(Kind.POUR, jug, target)]
+            amount += jug_capacity
+            if amount > capacity:
+                plan += [JugAction(Kind.EMPTY, target), JugAction(Kind.POUR, jug, target)]
+                amount -= capacity
+        else:
+            counts[jug] += 1
+            plan.append(JugAction(Kind.POUR, target, jug))
+            amount -= jug_capacity
+            if amount < 0:
+                plan += [JugAction(Kind.FILL, target), JugAction(Kind.POUR, target, jug)]
+                amount += capacity
+            plan.append(JugAction(Kind.EMPTY, jug))
+
+    return plan
+
+
+def _search(capacities, goal):
+    n_jugs = len(capacities)
+    actions = [JugAction(Kind.FILL, jug) for jug in range(n_jugs)]
+    actions += [JugAction(Kind.EMPTY, jug) for jug in range(n_jugs)]
+    actions += [JugAction(Kind.POUR, jug, target) for jug in range(n_jugs) for target in range(n_jugs) if jug != target]
+    # Groups of interchangeable jugs, swapping amounts between them makes for equivalent states
+    groups = [
+        [jug for jug in range(n_jugs) if capacities[jug] == capacity]
+        for capacity in sorted(set(capacities))
+    ]
+
+    def neighbors(amounts):
+        for action in actions:
+            yield action, apply_jug_action(capacities, amounts, action)
+
+    def canonical(amounts):
+        return tuple(tuple(sorted(amounts[jug] for jug in group)) for group in groups)
+
+    steps = bfs((0,) * n_jugs, neighbors, lambda amounts: goal in amounts, key=canonical)
+    if steps is None:
+        return None
+
+    return [action for action, _ in steps]
+
+
+def plan_jugs(capacities, goal):
+    """
+    Plans for any number of jugs
+    :param capacities: Sequence of jug capacities
+    :param goal: Desired amount in any of the jugs
+    :return: List of `JugAction`s (shortest, unless the instance is too big to search),
+             or `None` if impossible
+    """
+    capacities = tuple(capacities)
+    if not is_feasible(capacities, goal):
+        return None
+    if goal == 0:
+        return []
+    if len(capacities) == 1:
+        return [JugAction(Kind.FILL, 0)]
+    if len(capacities) == 2:
+        return plan_two(capacities, goal)
+
+    if math.prod(capacity + 1 for capacity in capacities) > MAX_SEARCH_STATES:
+        pairs = [
+            (jug1, jug2)
+            for jug1 in range(len(capacities)) for jug2 in range(jug1 + 1, len(capacities))
+            if is_feasible((capacities[jug1], capacities[jug2]), goal)
+        ]
+        if pairs:
+            return _first_cycle_to_goal(capacities, pairs, goal)
+
+        return _accumulate(capacities, goal)
+
+    return _search(capacities, goal)
@@ -6,7 +6,17 @@
 ##############################################################################
 ##############################################################################
 
+import os
+import sys
 from enum import Enum
+from functools import lru_cache
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from bfslib import bfs_tree, reconstruct_path
+from jugs import JugAction, Kind, apply_jug_action, plan_jugs, plan_two
+
+
+STATE_TABLE_CACHE_SIZE = 32  # Number of capacity pairs whose state tables `plan_many` keeps around
 
 
 class Action(Enum):
@@ -21,6 +31,17 @@ class Action(Enum):
     POUR_2_TO_1 = 6
 
 
+# `Action` of each two-jug action of the general planner (see jugs.py)
+TO_ACTION = {
+    JugAction(Kind.EMPTY, 0): Action.EMPTY_1,
+    JugAction(Kind.EMPTY, 1): Action.EMPTY_2,
+    JugAction(Kind.FILL, 0): Action.FILL_1,
+    JugAction(Kind.FILL, 1): Action.FILL_2,
+    JugAction(Kind.POUR, 0, 1): Action.POUR_1_TO_2,
+    JugAction(Kind.POUR, 1, 0): Action.POUR_2_TO_1,
+}
+
+
 def apply_action(jug1, jug2, curr_jugs, action):
     """
     Return state after applying action to some state of jugs
@@ -61,7 +82,51 @@ def plan(jug1, jug2, goal):
     # Return value:     List of <Action>s to be taken to obtain
     #                   the desired amount in any of the jugs
     #                   or `None` if case is impossible
-    raise NotImplementedError()
+    jug_actions = plan_two((jug1, jug2), goal)
+    if jug_actions is None:
+        return None
+
+    return [TO_ACTION[action] for action in jug_actions]
+
+
+@lru_cache(maxsize=STATE_TABLE_CACHE_SIZE)
+def _state_table(jug1, jug2):
+    """
+    Explores every state reachable from empty jugs
+    :return: Parents dict of the shortest-path tree (see `bfslib.reconstruct_path`) and a dict mapping
+             each measurable amount to the closest state holding it in either jug
+    """
+    def neighbors(curr_jugs):
+        for action in Action:
+            yield action, apply_action(jug1, jug2, curr_jugs, action)
+
+    parents = bfs_tree((0, 0), neighbors)
+    # States come in order of distance, so the first one holding an amount is the closest
+    closest = {}
+    for curr_jugs in parents:
+        for amount in curr_jugs:
+            closest.setdefault(amount, curr_jugs)
+
+    return parents, closest
+
+
+def plan_many(jug1, jug2, goals):
+    """
+    Plans for many goals with the same jugs, exploring the states of each pair of capacities only once
+    :param jug1: Maximum capacity in jug 1
+    :param jug2: Maximum capacity in jug 2
+    :param goals: Iterable of desired water amounts
+    :return: List with a plan per goal, each as `plan` would return it
+    """
+    parents, closest = _state_table(jug1, jug2)
+    plans = []
+    for goal in goals:
+        if goal in closest:
+            plans.append([action for action, _ in reconstruct_path(parents, closest[goal])])
+        else:
+            plans.append(None)
+
+    return plans
 
 
 ##############################################################################
@@ -96,11 +161,32 @@ def run_test_case(jug1, jug2, goal, possible=True, verbose=True):
     assert goal in jugs, f"Goal ({goal}) not in jugs ({jugs[0]}, {jugs[1]}) after plan execution"
 
 
+def reaches_goal(capacities, goal, actions):
+    amounts = (0,) * len(capacities)
+    for action in actions:
+        amounts = apply_jug_action(capacities, amounts, action)
+        if goal in amounts:
+            return True
+
+    return goal in amounts
+
+
 def main(verbose=True):
     run_test_case(3, 5, 4, verbose=verbose)
     run_test_case(5, 7, 6, verbose=verbose)
     run_test_case(4, 6, 3, possible=False, verbose=verbose)
 
+    for goal, actions in zip(range(9), plan_many(3, 5, range(9))):
+        assert (actions is None) == (goal > 5), f"Goal {goal} should{'' if goal > 5 else ' not'} be impossible"
+        assert actions is None or len(actions) == len(plan(3, 5, goal)), f"Plan for goal {goal} isn't shortest"
+
+    # Too big to search, with every pair of jugs sharing a factor
+    for capacities, goal in (((6, 10, 15015), 7), ((6, 10, 1000005), 1), ((30, 42, 70, 1000005), 1),
+                             ((6, 10, 15, 1000000), 500001)):
+        actions = plan_jugs(capacities, goal)
+        assert actions is not None and reaches_goal(capacities, goal, actions), \
+            f"Plan for goal {goal} with capacities {capacities} doesn't reach it"
+
     print("All test cases passed!")
 
 
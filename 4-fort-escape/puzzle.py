@@ -0,0 +1,212 @@
+##############################################################################
+#
+#               BFS zero-to-hero part 4:   fort puzzle states
+#               ---------------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# The puzzle's characters, actions and states, shared by the challenge
+# (main.py) and the state graph it's solved with (state_graph.py).
+
+from enum import Enum
+
+
+class Character(Enum):
+    """
+    Characters in puzzle (including the weight)
+    """
+    WEIGHT = 25
+    AMELIA = 50
+    OLIVIA = 75
+    LUCAS = 125
+
+
+class Action(Enum):
+    """
+    Possible actions to take (loading / unloading the pulley, lowering it)
+    """
+    LOWER_PULLEY = 1
+    LOAD_UP = 2
+    UNLOAD_UP = 3
+    LOAD_DOWN = 4
+    UNLOAD_DOWN = 5
+
+
+class State:
+    """
+    Object representing puzzle state in a given moment
+    """
+    def __init__(self):
+        """
+        Fresh puzzle state
+        """
+        self.up = set(Character)
+        self.down = set()
+        self.pulley_end1 = set()
+        self.pulley_end2 = set()
+        self.pulley_end1_up = True
+
+    def apply(self, action, character):
+        """
+        Attempt to apply action in current puzzle state.
+        In-place, raises AssertionError / ValueError if action isn't possible.
+        :param action: Action to perform
+        :param character: Character to perform action with, should be `None` if lowering pulley
+        """
+        if action == Action.LOWER_PULLEY and character is not None:
+            raise ValueError("Lowering pulley doesn't involve a character")
+        if action != Action.LOWER_PULLEY and character is None:
+            raise ValueError("Any action other than lowering pulley involves a character")
+
+        match action:
+            case Action.LOWER_PULLEY:
+                weight_diff = sum(x.value for x in self.pulley_end1) - sum(x.value for x in self.pulley_end2)
+                if not self.pulley_end1_up:
+                    weight_diff *= -1
+
+                assert weight_diff == 25, "Can only lower pulley if weight difference is 25 kg"
+                self.pulley_end1_up = not self.pulley_end1_up
+            case Action.LOAD_UP:
+                assert character in self.up, f"{character} not available for loading up"
+                if character == Character.WEIGHT and len(self.up) == 1:
+                    raise ValueError("No one available to load weight up")
+
+                self.up.remove(character)
+                pulley_end = self.pulley_end1 if self.pulley_end1_up else self.pulley_end2
+                pulley_end.add(character)
+            case Action.LOAD_DOWN:
+                assert character in self.down, f"{character} not available for loading down"
+                if character == Character.WEIGHT and len(self.down) == 1:
+                    raise ValueError("No one available to load weight down")
+
+                self.down.remove(character)
+                pulley_end = self.pulley_end2 if self.pulley_end1_up else self.pulley_end1
+                pulley_end.add(character)
+            case Action.UNLOAD_UP:
+                pulley_end = self.pulley_end1 if self.pulley_end1_up else self.pulley_end2
+                assert character in pulley_end, f"{character} not available for unloading up"
+                if character == Character.WEIGHT and len(self.up) == 0:
+                    raise ValueError("No one available to unload weight up")
+
+                pulley_end.remove(character)
+                self.up.add(character)
+            case Action.UNLOAD_DOWN:
+                pulley_end = self.pulley_end2 if self.pulley_end1_up else self.pulley_end1
+                assert character in pulley_end, f"{character} not available for unloading down"
+                if character == Character.WEIGHT and len(self.down) == 0:
+                    raise ValueError("No one available to unload weight down")
+
+                pulley_end.remove(character)
+                self.down.add(character)
+
+    def __str__(self):
+        """
+        :return: String representation of puzzle state
+        """
+        up = sorted(tuple(self.up), key=lambda x: x.value)
+        down = sorted(tuple(self.down), key=lambda x: x.value)
+        pulley_end1 = sorted(tuple(self.pulley_end1), key=lambda x: x.value)
+        pulley_end2 = sorted(tuple(self.pulley_end2), key=lambda x: x.value)
+        return  (f"Up: {up}, down: {down}, pulley end 1: {pulley_end1},"
+                 f" pulley end 2: {pulley_end2}, pulley end 1 up? {self.pulley_end1_up}")
+
+
+# Locations of characters in a `FrozenState`
+UP, DOWN, PULLEY_END1, PULLEY_END2 = range(4)
+LOCATION_BITS = 2
+# Characters that need to get down for the fort to be escaped
+ESCAPEES = (Character.OLIVIA, Character.AMELIA, Character.LUCAS)
+
+
+class FrozenState(int):
+    """
+    Immutable, hashable puzzle state packed into an int: bits 2i, 2i + 1 hold the location of the i-th
+    character (in `characters` order), and the next bit is set while pulley end 1 is up
+    """
+    characters = tuple(Character)
+    weight = Character.WEIGHT
+    # Weight difference at which the upper pulley end goes down
+    lowering_diff = 25
+
+    @classmethod
+    def initial(cls):
+        """
+        :return: Fresh puzzle state, same as `State()`
+        """
+        return cls(1 << LOCATION_BITS * len(cls.characters))
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        :param state: Mutable `State`
+        :return: Equivalent `FrozenState`
+        """
+        code = int(state.pulley_end1_up) << LOCATION_BITS * len(cls.characters)
+        for location, characters in enumerate((state.up, state.down, state.pulley_end1, state.pulley_end2)):
+            for character in characters:
+                code |= location << LOCATION_BITS * cls.characters.index(character)
+
+        return cls(code)
+
+    def to_state(self):
+        """
+        :return: Equivalent mutable `State`
+        """
+        state = State()
+        locations = (state.up, state.down, state.pulley_end1, state.pulley_end2)
+        state.up.clear()
+        for character in self.characters:
+            locations[self.location(character)].add(character)
+
+        state.pulley_end1_up = self.pulley_end1_up
+        return state
+
+    def location(self, character):
+        """
+        :return: Location (`UP`, `DOWN`, `PULLEY_END1` or `PULLEY_END2`) of `character`
+        """
+        return self >> LOCATION_BITS * self.characters.index(character) & 3
+
+    @property
+    def pulley_end1_up(self):
+        return bool(self >> LOCATION_BITS * len(self.characters) & 1)
+
+    def successors(self):
+        """
+        Legal moves, by the same rules as `State.apply`
+        :return: Generator of (Action, Character, next state) triplets, character being `None` when lowering
+        """
+        cls = type(self)
+        pulley_bit = 1 << LOCATION_BITS * len(self.characters)
+        locations = [self >> LOCATION_BITS * idx & 3 for idx in range(len(self.characters))]
+        n_up = locations.count(UP)
+        n_down = locations.count(DOWN)
+        upper_end, lower_end = (PULLEY_END1, PULLEY_END2) if self & pulley_bit else (PULLEY_END2, PULLEY_END1)
+
+        weight_diff = 0
+        for character, location in zip(self.characters, locations):
+            if location == upper_end:
+                weight_diff += character.value
+            elif location == lower_end:
+                weight_diff -= character.value
+
+        if weight_diff == self.lowering_diff:
+            yield Action.LOWER_PULLEY, None, cls(self ^ pulley_bit)
+
+        # (action, location moved from, location moved to, whether the weight can't go, by the number of
+        # people it leaves behind or joins)
+        moves = (
+            (Action.LOAD_UP, UP, upper_end, n_up == 1),
+            (Action.UNLOAD_UP, upper_end, UP, n_up == 0),
+            (Action.LOAD_DOWN, DOWN, lower_end, n_down == 1),
+            (Action.UNLOAD_DOWN, lower_end, DOWN, n_down == 0),
+        )
+        for action, src, dst, weight_stuck in moves:
+            for idx, (character, location) in enumerate(zip(self.characters, locations)):
+                if location == src and not (character == self.weight and weight_stuck):
+                    shift = LOCATION_BITS * idx
+                    yield action, character, cls(self ^ (src ^ dst) << shift)
+
+    def __repr__(self):
+        return str(self.to_state())
@@ -0,0 +1,165 @@
+##############################################################################
+#
+#               BFS zero-to-hero part 4:   full state graph
+#               ------------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# The fort's state space is tiny, so it's solved exhaustively once: every
+# state reachable from the start is enumerated along with its moves, labelled
+# with its distance to escaping (by a breadth-first search backwards from all
+# escaped states), and written to a JSON file together with the solution from
+# the start. Solving then is a lookup in that file.
+#
+# Nothing here is specific to the puzzle's cast: the state class (see
+# `puzzle.FrozenState`) and the characters that need to escape are parameters.
+# Each variant (other weights, an extra character) gets its own file, named
+# after a hash of its fingerprint, in the graphs/ cache directory.
+#
+# Usage: python state_graph.py [output directory]
+
+import hashlib
+import json
+import os
+import sys
+from collections import defaultdict
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from bfslib import bfs_distances, bfs_tree
+from puzzle import DOWN, ESCAPEES, FrozenState
+
+
+GRAPH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'graphs')
+
+
+def fingerprint(state_class, escapees):
+    """
+    :param state_class: `FrozenState` (sub)class defining the puzzle variant
+    :param escapees: Characters that need to get down
+    :return: JSON-compatible description of the variant, which a stored graph must match
+    """
+    return {
+        'characters': [[character.name, character.value] for character in state_class.characters],
+        'weight': state_class.weight.name,
+        'lowering_diff': state_class.lowering_diff,
+        'escapees': sorted(character.name for character in escapees),
+    }
+
+
+def graph_path(state_class, escapees, graph_dir):
+    """
+    :return: Path of the file holding the graph of a puzzle variant within `graph_dir`
+    """
+    digest = hashlib.sha1(json.dumps(fingerprint(state_class, escapees), sort_keys=True).encode()).hexdigest()
+    return os.path.join(graph_dir, f'state_graph-{digest[:16]}.json')
+
+
+def build_graph(state_class, escapees):
+    """
+    Enumerates and solves the whole state space of a puzzle variant
+    :param state_class: `FrozenState` (sub)class defining the puzzle variant
+    :param escapees: Characters that need to get down
+    :return: JSON-compatible dict with the variant's fingerprint, the initial state, per state its distance
+             to escaping (`None` if it can't) and moves as [action, character, next state] (names and state
+             codes), and the solution from the initial state as [action, character] pairs (`None` if unsolvable)
+    """
+    initial = state_class.initial()
+    states = list(bfs_tree(initial, lambda state: ((None, nxt) for _, _, nxt in state.successors())))
+    moves = {state: list(state.successors()) for state in states}
+    predecessors = defaultdict(list)
+    for state, state_moves in moves.items():
+        for _, _, nxt in state_moves:
+            predecessors[nxt].append(state)
+
+    escaped = [state for state in states if all(state.location(character) == DOWN for character in escapees)]
+    distances = bfs_distances(escaped, lambda state: ((None, prev) for prev in predecessors[state]))
+
+    solution = None
+    if initial in distances:
+        solution = []
+        state = initial
+        while distances[state] > 0:
+            action, character, state = next(
+                move for move in moves[state] if distances.get(move[2]) == distances[state] - 1
+            )
+            solution.append([action.name, None if character is None else character.name])
+
+    return {
+        'fingerprint': fingerprint(state_class, escapees),
+        'initial': int(initial),
+        'states': {
+            str(int(state)): {
+                'distance': distances.get(state),
+                'moves': [
+                    [action.name, None if character is None else character.name, int(nxt)]
+                    for action, character, nxt in moves[state]
+                ],
+            }
+            for state in states
+        },
+        'solution': solution,
+    }
+
+
+def write_graph(path, graph):
+    """
+    Writes a graph atomically, so that a partially written file is never picked up (the temporary file is
+    per process, so that processes building the graph at the same time don't write over each other's)
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(graph, f)
+
+    os.replace(tmp_path, path)
+
+
+def load_graph(path, state_class, escapees):
+    """
+    :return: Graph stored at `path` (see `build_graph`), or `None` if missing or built for a different variant
+    """
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'r') as f:
+        graph = json.load(f)
+
+    if graph['fingerprint'] != fingerprint(state_class, escapees):
+        return None
+
+    return graph
+
+
+def solve(state_class, escapees, graph_dir=GRAPH_DIR):
+    """
+    Looks the solution up in the stored graph of the variant, building it first if needed
+    :param state_class: `FrozenState` (sub)class defining the puzzle variant
+    :param escapees: Characters that need to get down
+    :param graph_dir: Directory holding the graph files
+    :return: List of (action name, character name or `None`) pairs, or `None` if the variant is unsolvable
+    """
+    path = graph_path(state_class, escapees, graph_dir)
+    graph = load_graph(path, state_class, escapees)
+    if graph is None:
+        graph = build_graph(state_class, escapees)
+        os.makedirs(graph_dir, exist_ok=True)
+        write_graph(path, graph)
+
+    return graph['solution']
+
+
+def main():
+    graph_dir = sys.argv[1] if len(sys.argv) > 1 else GRAPH_DIR
+    path = graph_path(FrozenState, ESCAPEES, graph_dir)
+    graph = build_graph(FrozenState, ESCAPEES)
+    os.makedirs(graph_dir, exist_ok=True)
+    write_graph(path, graph)
+
+    distances = [state['distance'] for state in graph['states'].values()]
+    print(f"Reachable states: {len(distances)}, written to {path}")
+    print(f"States that can still escape: {sum(distance is not None for distance in distances)}")
+    print(f"Solution length: {len(graph['solution'])}")
+
+
+if __name__ == '__main__':
+    main()
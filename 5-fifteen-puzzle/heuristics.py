@@ -0,0 +1,99 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 5:   heuristics
+#                   -------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Admissible distance estimates for packed boards (see `packed`), for use with
+# `bfslib.a_star` / `bfslib.ida_star`.
+
+import os
+from bisect import bisect_left
+
+from packed import SIZE, N_SQUARES, square_at, square_positions
+from pattern_db import PATTERNS, PDB_DIR, PatternTable, build, table_path
+
+
+# MANHATTAN[square][idx]: distance of `square` at index `idx` from its solved position
+MANHATTAN = [[0] * N_SQUARES] + [
+    [abs(idx // SIZE - (square - 1) // SIZE) + abs(idx % SIZE - (square - 1) % SIZE) for idx in range(N_SQUARES)]
+    for square in range(1, N_SQUARES)
+]
+
+
+def manhattan_distance(state):
+    """
+    Sum of distances of all squares from their solved positions
+    :param state: Packed board
+    :return: Admissible distance estimate
+    """
+    return sum(MANHATTAN[(state >> (4 * idx)) & 15][idx] for idx in range(N_SQUARES))
+
+
+def linear_conflict(state):
+    """
+    Manhattan distance plus 2 moves for each square that has to leave its solved row / column
+    to let other squares in the same line pass it
+    :param state: Packed board
+    :return: Admissible distance estimate
+    """
+    extra = 0
+    for line in range(SIZE):
+        row_targets = []
+        col_targets = []
+        for k in range(SIZE):
+            square = square_at(state, line * SIZE + k)
+            if square and (square - 1) // SIZE == line:
+                row_targets.append((square - 1) % SIZE)
+
+            square = square_at(state, k * SIZE + line)
+            if square and (square - 1) % SIZE == line:
+                col_targets.append((square - 1) // SIZE)
+
+        extra += 2 * (len(row_targets) - _longest_increasing(row_targets))
+        extra += 2 * (len(col_targets) - _longest_increasing(col_targets))
+
+    return manhattan_distance(state) + extra
+
+
+def _longest_increasing(values):
+    tails = []
+    for value in values:
+        idx = bisect_left(tails, value)
+        if idx == len(tails):
+            tails.append(value)
+        else:
+            tails[idx] = value
+
+    return len(tails)
+
+
+class PatternDatabase:
+    """
+    Additive pattern database heuristic over disjoint patterns
+    """
+    def __init__(self, patterns=PATTERNS, pdb_dir=PDB_DIR):
+        """
+        Maps the pattern table files in `pdb_dir`, generating (and storing) the missing ones.
+        Generating a 6-square pattern table takes about a minute, so prefer building them
+        ahead of time by running `pattern_db.py`.
+        :param patterns: Disjoint tuples of square numbers
+        :param pdb_dir: Directory holding the pattern table files
+        """
+        self.tables = []
+        for pattern in patterns:
+            path = table_path(pattern, pdb_dir)
+            if not os.path.exists(path):
+                build(pattern, pdb_dir)
+
+            self.tables.append(PatternTable(path))
+
+    def __call__(self, state):
+        """
+        :param state: Packed board
+        :return: Admissible distance estimate
+        """
+        positions = square_positions(state)
+        return sum(table.distance(positions) for table in self.tables)
@@ -6,8 +6,17 @@
 ##############################################################################
 ##############################################################################
 
+import os
+import sys
 from enum import Enum
 from copy import deepcopy
+from functools import partial
+from operator import eq
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from bfslib import bfs, bidirectional_bfs, external_bfs, parallel_bfs, a_star, ida_star
+import packed
+import heuristics
 
 
 class Direction(Enum):
@@ -60,16 +69,52 @@ def find_empty_pos(board):
             if board[row][col] == 0][0]
 
 
-def find_instructions(board):
+def find_instructions(board, method='bidirectional', heuristic=heuristics.linear_conflict):
     # Params:
     #   board:          Nested list describing current board state. List of list of ints,
     #                   each number denotes itself except 0 which denotes the empty square.
+    #   method:         Search method, one of:
+    #                       'bfs':              Plain BFS
+    #                       'parallel':         Plain BFS spread over a worker process per CPU, finding
+    #                                           the same solution as 'bfs'
+    #                       'external':         Plain BFS keeping its layers and visited boards in temporary
+    #                                           files, with memory use bounded regardless of depth
+    #                       'bidirectional':    BFS from the initial and solved boards simultaneously,
+    #                                           meeting in the middle (much faster on deep scrambles)
+    #                       'astar' / 'idastar': Informed search guided by `heuristic`
+    #   heuristic:      Admissible distance estimate for packed boards, used by informed methods
+    #                   (e.g. `heuristics.linear_conflict` or a `heuristics.PatternDatabase`)
     #
     # Return value:     List of <Direction>s to move the empty square in order to solve the puzzle.
     #                   Note that we're treating the empty square as if it's moving around, even
     #                   though in practice it's other squares that are moving onto the empty one.
     #
-    raise NotImplementedError()
+    # Search over packed boards, with moves as (drow, dcol) deltas
+    start = packed.pack(board)
+
+    def is_solved(state):
+        return state == packed.SOLVED
+
+    match method:
+        case 'bfs':
+            steps = bfs(start, packed.successors, is_solved)
+        case 'parallel':
+            steps = parallel_bfs(start, packed.successors, partial(eq, packed.SOLVED), packed.WIDTH)
+        case 'external':
+            steps = external_bfs(start, packed.successors, is_solved, packed.WIDTH)
+        case 'bidirectional':
+            steps = bidirectional_bfs(start, [packed.SOLVED], packed.successors, packed.predecessors)
+        case 'astar':
+            steps = a_star(start, packed.successors, is_solved, heuristic)
+        case 'idastar':
+            steps = ida_star(start, packed.successors, is_solved, heuristic)
+        case _:
+            raise ValueError(f"Unknown search method: {method}")
+
+    if steps is None:
+        return []
+
+    return [Direction(delta) for delta, _ in steps]
 
 
 ##############################################################################
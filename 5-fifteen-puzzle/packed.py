@@ -0,0 +1,118 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 5:   packed boards
+#                   ----------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# A board is packed into a single int: 4 bits per square in row-major order
+# (square i occupies bits 4i..4i+3, 0 denoting the empty square), with the
+# index of the empty square cached above the 64 board bits. Packed boards are
+# hashable, cheap to compare and moved around with a few shifts and masks.
+
+SIZE = 4
+N_SQUARES = SIZE * SIZE
+BLANK_SHIFT = 4 * N_SQUARES
+BOARD_MASK = (1 << BLANK_SHIFT) - 1
+# Number of bytes that fit a packed board
+WIDTH = (BLANK_SHIFT + 4 + 7) // 8
+
+# Per empty-square index, list of ((drow, dcol), target index) legal moves
+MOVES = [
+    [((drow, dcol), (idx // SIZE + drow) * SIZE + idx % SIZE + dcol)
+     for drow, dcol in ((-1, 0), (1, 0), (0, -1), (0, 1))
+     if 0 <= idx // SIZE + drow < SIZE and 0 <= idx % SIZE + dcol < SIZE]
+    for idx in range(N_SQUARES)
+]
+
+
+def pack(board):
+    """
+    Packs a nested-list board into an int
+    :param board: SIZE x SIZE nested list of ints, 0 denoting the empty square
+    :return: Packed board
+    """
+    bits = 0
+    blank = None
+    for idx, square in enumerate(sum(board, [])):
+        bits |= square << (4 * idx)
+        if square == 0:
+            blank = idx
+
+    return bits | blank << BLANK_SHIFT
+
+
+def unpack(state):
+    """
+    Unpacks a packed board back into the nested-list format
+    :param state: Packed board
+    :return: SIZE x SIZE nested list of ints
+    """
+    return [[(state >> (4 * (row * SIZE + col))) & 15 for col in range(SIZE)] for row in range(SIZE)]
+
+
+def blank_index(state):
+    """
+    :param state: Packed board
+    :return: Row-major index of the empty square
+    """
+    return state >> BLANK_SHIFT
+
+
+def square_at(state, idx):
+    """
+    :param state: Packed board
+    :param idx: Row-major square index
+    :return: Number on the square (0 for the empty square)
+    """
+    return (state >> (4 * idx)) & 15
+
+
+def square_positions(state):
+    """
+    :param state: Packed board
+    :return: List mapping each square number (0 for the empty square) to its index on the board
+    """
+    positions = [0] * N_SQUARES
+    for idx in range(N_SQUARES):
+        positions[(state >> (4 * idx)) & 15] = idx
+
+    return positions
+
+
+def move_blank(state, target):
+    """
+    Moves the empty square onto an adjacent square
+    :param state: Packed board
+    :param target: Row-major index of the square adjacent to the empty one
+    :return: New packed board
+    """
+    blank = state >> BLANK_SHIFT
+    square = (state >> (4 * target)) & 15
+    bits = (state & BOARD_MASK & ~(15 << (4 * target))) | square << (4 * blank)
+    return bits | target << BLANK_SHIFT
+
+
+def successors(state):
+    """
+    Generates the boards reachable by moving the empty square once
+    :param state: Packed board
+    :return: Generator of ((drow, dcol), next packed board) tuples
+    """
+    for delta, target in MOVES[state >> BLANK_SHIFT]:
+        yield delta, move_blank(state, target)
+
+
+def predecessors(state):
+    """
+    Generates the boards from which a single move leads to `state`
+    :param state: Packed board
+    :return: Generator of ((drow, dcol), previous packed board) tuples, such that
+             moving the empty square of the previous board by (drow, dcol) yields `state`
+    """
+    for (drow, dcol), target in MOVES[state >> BLANK_SHIFT]:
+        yield (-drow, -dcol), move_blank(state, target)
+
+
+SOLVED = pack([[(row * SIZE + col + 1) % N_SQUARES for col in range(SIZE)] for row in range(SIZE)])
@@ -0,0 +1,213 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 5:   pattern databases
+#                   --------------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Pattern database files: a small header followed by one nibble per placement
+# index (low nibble first). Each nibble stores half the gap between the
+# placement's true distance and the Manhattan distance of its squares - the
+# gap is always even, and small enough to fit. Loading maps the file read-only,
+# so lookups are zero-copy and processes share the same page cache.
+#
+# Build the default tables with:    python pattern_db.py
+# or custom patterns with:          python pattern_db.py 1,2,3,4 5,6,7,8 ...
+
+import os
+import sys
+import mmap
+import struct
+import zlib
+from array import array
+
+from packed import SIZE, N_SQUARES, MOVES
+
+
+# Default disjoint 6-6-3 partition of the squares into patterns
+PATTERNS = ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4))
+PDB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pdb')
+MAGIC = b'15PD'
+# magic, number of pattern squares, pattern squares (zero padded), number of entries, payload crc32
+HEADER = struct.Struct('<4sB16sQI')
+UNREACHABLE = 15
+
+
+def pattern_manhattan(placement, pattern):
+    """
+    :param placement: Placement index
+    :param pattern: Tuple of square numbers
+    :return: Sum of distances of the pattern squares from their solved positions
+    """
+    distance = 0
+    for i, square in enumerate(pattern):
+        idx = (placement >> (4 * i)) & 15
+        distance += abs(idx // SIZE - (square - 1) // SIZE) + abs(idx % SIZE - (square - 1) % SIZE)
+
+    return distance
+
+
+def build_pattern_table(pattern):
+    """
+    Backward BFS from the solved board over placements of the pattern squares. Only moves of
+    pattern squares are counted, which keeps tables of disjoint patterns additive. The empty
+    square roams freely between them, so the search runs over (placement, reachable empty region) pairs.
+    :param pattern: Tuple of square numbers
+    :return: bytearray mapping placement index to the minimal number of pattern square moves
+             needed to solve it (255 for impossible placements)
+    """
+    n = len(pattern)
+    table = bytearray(b'\xff') * (1 << (4 * n))
+    # Per placement, bitmask of empty square positions already visited, and of those queued for a visit
+    visited = array('H', bytes(2 << (4 * n)))
+    queued = array('H', bytes(2 << (4 * n)))
+
+    solved = sum((square - 1) << (4 * i) for i, square in enumerate(pattern))
+    # (placement, empty square position) pairs packed as placement << 4 | position, each queued once
+    frontier = array('L', [solved << 4 | N_SQUARES - 1])
+    queued[solved] = 1 << (N_SQUARES - 1)
+    distance = 0
+    while frontier:
+        next_frontier = array('L')
+        for entry in frontier:
+            placement, blank = entry >> 4, entry & 15
+            if visited[placement] >> blank & 1:
+                continue
+
+            owner = {}
+            for i in range(n):
+                owner[(placement >> (4 * i)) & 15] = i
+
+            # Flood-fill the region the empty square can reach without moving pattern squares
+            region = 1 << blank
+            stack = [blank]
+            while stack:
+                idx = stack.pop()
+                for _, target in MOVES[idx]:
+                    if target in owner:
+                        # Pattern square moves onto the empty square, which takes its place
+                        new_placement = placement + ((idx - target) << (4 * owner[target]))
+                        if not (visited[new_placement] | queued[new_placement]) >> target & 1:
+                            queued[new_placement] |= 1 << target
+                            next_frontier.append(new_placement << 4 | target)
+                    elif not region >> target & 1:
+                        region |= 1 << target
+                        stack.append(target)
+
+            visited[placement] |= region
+            if table[placement] == 255:
+                table[placement] = distance
+
+        frontier = next_frontier
+        distance += 1
+
+    return table
+
+
+def write_table(path, pattern, table):
+    """
+    Writes a pattern table in the nibble-packed file format
+    :param path: Destination file path
+    :param pattern: Tuple of square numbers
+    :param table: Pattern table, as returned by `build_pattern_table`
+    """
+    payload = bytearray((len(table) + 1) // 2)
+    for placement, distance in enumerate(table):
+        if distance == 255:
+            nibble = UNREACHABLE
+        else:
+            nibble = (distance - pattern_manhattan(placement, pattern)) // 2
+            if nibble >= UNREACHABLE:
+                raise ValueError(f"Distance {distance} of placement {placement} doesn't fit in a nibble")
+
+        payload[placement >> 1] |= nibble << ((placement & 1) << 2)
+
+    header = HEADER.pack(MAGIC, len(pattern), bytes(pattern), len(table), zlib.crc32(payload))
+    # Write to a temporary file first, so concurrent readers never see a partial table
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+
+    os.replace(tmp_path, path)
+
+
+class PatternTable:
+    """
+    Read-only, memory-mapped pattern table file
+    """
+    def __init__(self, path, verify=False):
+        """
+        :param path: Pattern table file path
+        :param verify: Whether to validate the payload checksum (reads the whole file)
+        """
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, n, pattern, self.size, checksum = HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a pattern table file")
+
+        self.pattern = tuple(pattern[:n])
+        if len(self._mm) != HEADER.size + (self.size + 1) // 2:
+            raise ValueError(f"{path} is truncated")
+        if verify and zlib.crc32(memoryview(self._mm)[HEADER.size:]) != checksum:
+            raise ValueError(f"{path} failed checksum validation")
+
+        self._manhattan = [
+            [abs(idx // SIZE - (square - 1) // SIZE) + abs(idx % SIZE - (square - 1) % SIZE)
+             for idx in range(N_SQUARES)]
+            for square in self.pattern
+        ]
+
+    def distance(self, positions):
+        """
+        :param positions: Square positions, as returned by `packed.square_positions`
+        :return: Minimal number of pattern square moves needed to solve the pattern squares
+        """
+        placement = 0
+        manhattan = 0
+        for i, square in enumerate(self.pattern):
+            idx = positions[square]
+            placement |= idx << (4 * i)
+            manhattan += self._manhattan[i][idx]
+
+        nibble = (self._mm[HEADER.size + (placement >> 1)] >> ((placement & 1) << 2)) & 15
+        return manhattan + 2 * nibble
+
+    def close(self):
+        self._mm.close()
+
+
+def table_path(pattern, pdb_dir):
+    """
+    :return: Path of the file holding the table of `pattern` within `pdb_dir`
+    """
+    return os.path.join(pdb_dir, '-'.join(map(str, pattern)) + '.pdb')
+
+
+def build(pattern, pdb_dir):
+    """
+    Generates a pattern table and writes it into `pdb_dir`
+    :return: Path of the written file
+    """
+    path = table_path(pattern, pdb_dir)
+    os.makedirs(pdb_dir, exist_ok=True)
+    write_table(path, pattern, build_pattern_table(pattern))
+    return path
+
+
+def main():
+    if len(sys.argv) > 1:
+        patterns = [tuple(map(int, arg.split(','))) for arg in sys.argv[1:]]
+    else:
+        patterns = PATTERNS
+
+    for pattern in patterns:
+        print(f"Building pattern {pattern}...")
+        print(f"Written to {build(pattern, PDB_DIR)}")
+
+
+if __name__ == '__main__':
+    main()
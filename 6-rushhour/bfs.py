@@ -6,7 +6,14 @@
 ##############################################################################
 ##############################################################################
 
+import os
+import sys
 from enum import Enum
+from functools import partial
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from bfslib import bfs, bidirectional_bfs, external_bfs, parallel_bfs
+from bitboard import Bitboard
 
 
 CELLS = 6
@@ -30,7 +37,46 @@ class Orientation(Enum):
     VERTICAL = (1, 0)
 
 
-def find_instructions(board):
+def red_car_index(board):
+    """
+    Finds the player's car, i.e. the reddest of them all
+    :param board: List of vehicle dicts
+    :return: Index of the player's car in `board`
+    """
+    return max(range(len(board)), key=lambda idx: board[idx]['color'][0] / max(board[idx]['color'][1:]))
+
+
+def preprocess(board):
+    """
+    Sets each vehicle's orientation, from whether its first two cells share a row
+    :param board: List of vehicle dicts, as loaded from a challenge file
+    :return: `board`, its vehicles holding their `Orientation` under 'orientation'
+    """
+    for car in board:
+        car['orientation'] = (
+            Orientation.HORIZONTAL if car['cells'][0][0] == car['cells'][1][0] else Orientation.VERTICAL
+        )
+
+    return board
+
+
+def to_instructions(moves, bitboard):
+    """
+    Expands bitboard slides into single-cell instructions
+    :param moves: List of (vehicle index, signed delta) slides
+    :param bitboard: `Bitboard` the slides were generated by
+    :return: List of (vehicle_index, <Direction>) tuples
+    """
+    instructions = []
+    for idx, delta in moves:
+        drow, dcol = bitboard.orientations[idx]
+        direction = Direction((drow, dcol)) if delta > 0 else Direction((-drow, -dcol))
+        instructions.extend([(idx, direction)] * abs(delta))
+
+    return instructions
+
+
+def find_instructions(board, bidirectional=False, slides=False, processes=None, external=False):
     # Params:
     #   board:          List of dictionaries describing current board state. Each dict is of the form:
     #                   {
@@ -39,8 +85,38 @@ def find_instructions(board):
     #                       "orientation": <Orientation.HORIZONTAL>  # Vehicle orientation
     #                   }
     #                   The player's car is the reddest of them all :)
+    #   bidirectional:  Whether to search from the initial state and all winning states simultaneously,
+    #                   meeting in the middle
+    #   slides:         Whether to count sliding a vehicle several cells as a single move, i.e. minimize
+    #                   the number of slides rather than the number of single-cell instructions
+    #   processes:      Number of worker processes to spread a (unidirectional) search over, `None` to search
+    #                   in this process. Either way the instructions found are the same.
+    #   external:       Whether to keep a (unidirectional, single process) search's layers and visited states
+    #                   in temporary files rather than in memory, for clusters too big to fit
     #
     # Return value:     List of tuples of (vehicle_index, <Direction>) to move the vehicles
     #                   in order to solve the puzzle.
     #
-    raise NotImplementedError()
+    bitboard = Bitboard(board, red_car_index(board), CELLS)
+
+    def neighbors(state):
+        return bitboard.successors(state, slides)
+
+    def predecessors(state):
+        return bitboard.predecessors(state, slides)
+
+    if bidirectional:
+        steps = bidirectional_bfs(bitboard.initial, bitboard.winning_states(), neighbors, predecessors)
+    elif external:
+        steps = external_bfs(bitboard.initial, neighbors, bitboard.is_won, bitboard.width)
+    elif processes is not None:
+        # Bound methods rather than closures, so that they can be pickled over to the workers
+        steps = parallel_bfs(bitboard.initial, partial(bitboard.successors, multi=slides), bitboard.is_won,
+                             bitboard.width, processes)
+    else:
+        steps = bfs(bitboard.initial, neighbors, bitboard.is_won)
+
+    if steps is None:
+        return []
+
+    return to_instructions([move for move, _ in steps], bitboard)
@@ -0,0 +1,177 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 6:   Rush hour bitboards
+#                   ----------------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# A board state is packed into a single int: the low CELLS * CELLS bits are the
+# occupancy mask (cell (row, col) is bit row * CELLS + col), and above them each
+# vehicle has a 3-bit position along its lane. Vehicles never leave their lane,
+# so lane, orientation and length live in per-puzzle tables instead of the state.
+# States are hashable as-is, and a slide is a single XOR + add.
+
+POS_BITS = 3
+POS_MASK = (1 << POS_BITS) - 1
+
+
+class Bitboard:
+    """
+    Per-puzzle move tables for packed Rush hour states
+    """
+    def __init__(self, board, red_idx, cells):
+        """
+        :param board: List of vehicle dicts (see `bfs.find_instructions`), defining vehicle lanes
+        :param red_idx: Index of the player's car
+        :param cells: Number of cells per row / column
+        """
+        self.cells = cells
+        self.n_vehicles = len(board)
+        self.red_idx = red_idx
+        self.pos_shift = cells * cells
+        # Number of bytes that fit any packed state
+        self.width = (self.pos_shift + POS_BITS * self.n_vehicles + 7) // 8
+        self.orientations = []
+        self.lengths = []
+        self.lane_starts = []
+        # cell_bits[v][k]: bit of the k-th cell along vehicle v's lane
+        self.cell_bits = []
+        for car in board:
+            drow, dcol = car['orientation'].value
+            row, col = min(map(tuple, car['cells']))
+            lane_start = (row * dcol, col * drow)
+            self.orientations.append((drow, dcol))
+            self.lengths.append(len(car['cells']))
+            self.lane_starts.append(lane_start)
+            self.cell_bits.append([
+                1 << ((lane_start[0] + k * drow) * cells + lane_start[1] + k * dcol) for k in range(cells)
+            ])
+
+        self.win_pos = cells - self.lengths[red_idx]
+        self.initial = self.encode([min(map(tuple, car['cells'])) for car in board])
+
+    def encode(self, anchors):
+        """
+        :param anchors: List of each vehicle's (row, col) top-left cell
+        :return: Packed state
+        """
+        state = 0
+        for v, (row, col) in enumerate(anchors):
+            drow, dcol = self.orientations[v]
+            pos = row * drow + col * dcol
+            for k in range(pos, pos + self.lengths[v]):
+                state |= self.cell_bits[v][k]
+
+            state |= pos << (self.pos_shift + POS_BITS * v)
+
+        return state
+
+    def decode(self, state):
+        """
+        :param state: Packed state
+        :return: List of each vehicle's (row, col) top-left cell
+        """
+        anchors = []
+        for v in range(self.n_vehicles):
+            pos = self.position(state, v)
+            (row, col), (drow, dcol) = self.lane_starts[v], self.orientations[v]
+            anchors.append((row + pos * drow, col + pos * dcol))
+
+        return anchors
+
+    def position(self, state, v):
+        """
+        :return: Position of vehicle `v` along its lane
+        """
+        return (state >> (self.pos_shift + POS_BITS * v)) & POS_MASK
+
+    def slide(self, state, v, delta):
+        """
+        Slides a vehicle without legality checks
+        :param state: Packed state
+        :param v: Vehicle index
+        :param delta: Signed number of cells to slide by, positive being down / right
+        :return: New packed state
+        """
+        pos = self.position(state, v)
+        length = self.lengths[v]
+        bits = self.cell_bits[v]
+        flip = 0
+        for k in range(min(pos, pos + delta), max(pos, pos + delta)):
+            flip ^= bits[k] ^ bits[k + length]
+
+        return (state ^ flip) + (delta << (self.pos_shift + POS_BITS * v))
+
+    def successors(self, state, multi=False):
+        """
+        Generates the states reachable with a single slide
+        :param state: Packed state
+        :param multi: Whether a slide may move a vehicle more than one cell
+        :return: Generator of ((vehicle index, signed delta), next state) tuples
+        """
+        for v in range(self.n_vehicles):
+            pos = (state >> (self.pos_shift + POS_BITS * v)) & POS_MASK
+            length = self.lengths[v]
+            bits = self.cell_bits[v]
+            inc = 1 << (self.pos_shift + POS_BITS * v)
+
+            nxt = state
+            k = pos + length
+            while k < self.cells and not nxt & bits[k]:
+                nxt = (nxt ^ bits[k] ^ bits[k - length]) + inc
+                yield (v, k - pos - length + 1), nxt
+                if not multi:
+                    break
+                k += 1
+
+            nxt = state
+            k = pos - 1
+            while k >= 0 and not nxt & bits[k]:
+                nxt = (nxt ^ bits[k] ^ bits[k + length]) - inc
+                yield (v, k - pos), nxt
+                if not multi:
+                    break
+                k -= 1
+
+    def predecessors(self, state, multi=False):
+        """
+        Generates the states from which a single slide leads to `state`.
+        Slides are reversible, so these are the successors paired with the opposite slide.
+        :return: Generator of ((vehicle index, signed delta), previous state) tuples
+        """
+        for (v, delta), prev in self.successors(state, multi):
+            yield (v, -delta), prev
+
+    def is_won(self, state):
+        """
+        :return: True if the player's car reached the exit
+        """
+        return self.position(state, self.red_idx) == self.win_pos
+
+    def winning_states(self):
+        """
+        Enumerates every legal placement of the vehicles (each within its own lane) where the player's car is
+        at the exit. Unreachable placements are included, there's no cheap way to rule them out.
+        :return: Generator of packed winning states
+        """
+        red_length = self.lengths[self.red_idx]
+        base = sum(self.cell_bits[self.red_idx][self.win_pos:self.win_pos + red_length])
+        base |= self.win_pos << (self.pos_shift + POS_BITS * self.red_idx)
+
+        def place(v, curr):
+            if v == self.n_vehicles:
+                yield curr
+                return
+            if v == self.red_idx:
+                yield from place(v + 1, curr)
+                return
+
+            length = self.lengths[v]
+            bits = self.cell_bits[v]
+            for pos in range(self.cells - length + 1):
+                mask = sum(bits[pos:pos + length])
+                if not curr & mask:
+                    yield from place(v + 1, curr | mask | pos << (self.pos_shift + POS_BITS * v))
+
+        return place(0, base)
@@ -13,7 +13,7 @@ def main():
 
     run_challenge(window_surface, clock, 1)
     run_challenge(window_surface, clock, 2)
-    # run_challenge(window_surface, clock, 3)  # Could take a (relatively) long time to solve
+    run_challenge(window_surface, clock, 3)
     run_challenge(window_surface, clock, 4)
 
 
@@ -23,7 +23,7 @@ def main():
 import json
 import pygame
 from copy import deepcopy
-from bfs import find_instructions, Orientation, Direction, CELLS
+from bfs import find_instructions, preprocess, Orientation, Direction, CELLS
 
 
 W, H = 600, 600
@@ -35,15 +35,6 @@ TRANSITION_FRAMES = FPS // 4
 CELL_SIZE = W / CELLS
 
 
-def preprocess(board_state):
-    for car in board_state:
-        car['orientation'] = (
-            Orientation.HORIZONTAL if car['cells'][0][0] == car['cells'][1][0] else Orientation.VERTICAL
-        )
-
-    return board_state
-
-
 def test_instruction(board, instruction):
     try:
         car = board[instruction[0]]
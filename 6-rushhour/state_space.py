@@ -0,0 +1,194 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 6:   Rush hour state space
+#                   ------------------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Enumerates the whole connected state space of a challenge layout and indexes
+# every state by its distance to the nearest winning state. Solving any state in
+# the cluster is then a lookup plus greedy descent, and the distances double as
+# a difficulty ranking.
+#
+# Usage:    python state_space.py challenges/3.json [index path]
+
+import os
+import sys
+import json
+import mmap
+import struct
+import zlib
+from bisect import bisect_left
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from bfs import CELLS, preprocess, red_car_index, to_instructions
+from bitboard import Bitboard
+from bfslib import bfs_distances
+
+
+MAGIC = b'RHIX'
+# magic, layout fingerprint, state width in bytes, whether distances count slides, number of records
+HEADER = struct.Struct('<4sIBBQ')
+DISTANCE = struct.Struct('<H')
+INDEX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'indexes')
+
+
+def load_layout(path):
+    """
+    Loads a challenge file into a list of vehicle dicts, including orientations
+    :param path: Challenge JSON path
+    :return: List of vehicle dicts
+    """
+    with open(path, 'r') as f:
+        return preprocess(json.load(f))
+
+
+def layout_fingerprint(bitboard):
+    """
+    :return: Checksum of the vehicle lanes and lengths, which packed states are only meaningful with
+    """
+    return zlib.crc32(repr((bitboard.lane_starts, bitboard.orientations, bitboard.lengths, bitboard.red_idx)).encode())
+
+
+def explore(bitboard, slides=False):
+    """
+    Enumerates the connected state space around `bitboard.initial` and finds each state's distance to a win
+    :param bitboard: `Bitboard` of the layout
+    :param slides: Whether to measure distances in slides rather than single-cell instructions
+    :return: Dict mapping every state in the cluster to its distance from the nearest winning state
+             (states from which no win is reachable are left out)
+    """
+    def neighbors(state):
+        return bitboard.successors(state, slides)
+
+    cluster = bfs_distances([bitboard.initial], neighbors)
+    # Slides are reversible, so a reverse search from the winning states expands successors too
+    return bfs_distances((state for state in cluster if bitboard.is_won(state)), neighbors)
+
+
+def write_index(path, bitboard, distances, slides=False):
+    """
+    Writes distances as fixed-width (state, distance) records sorted by state
+    :param path: Destination file path
+    :param bitboard: `Bitboard` the states were generated by
+    :param distances: Dict mapping states to distances, as returned by `explore`
+    :param slides: The `slides` flag `distances` were computed with
+    """
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, layout_fingerprint(bitboard), bitboard.width, slides, len(distances)))
+        for state in sorted(distances):
+            f.write(state.to_bytes(bitboard.width, 'little'))
+            f.write(DISTANCE.pack(distances[state]))
+
+
+class DifficultyIndex:
+    """
+    Memory-mapped state -> distance-to-win index of a layout's cluster
+    """
+    def __init__(self, path, bitboard):
+        """
+        :param path: Index file path
+        :param bitboard: `Bitboard` of the layout the index was built for
+        """
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, fingerprint, self._width, slides, self._count = HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Rush hour index file")
+        if fingerprint != layout_fingerprint(bitboard):
+            raise ValueError(f"{path} was built for a different vehicle layout")
+
+        self.bitboard = bitboard
+        self.slides = bool(slides)
+        self._record = self._width + DISTANCE.size
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        """
+        :return: The i-th smallest indexed state
+        """
+        offset = HEADER.size + i * self._record
+        return int.from_bytes(self._mm[offset:offset + self._width], 'little')
+
+    def _distance_at(self, i):
+        return DISTANCE.unpack_from(self._mm, HEADER.size + i * self._record + self._width)[0]
+
+    def distance(self, state):
+        """
+        :param state: Packed state
+        :return: Number of moves to the nearest winning state, or `None` if the state isn't indexed
+        """
+        i = bisect_left(self, state)
+        if i < self._count and self[i] == state:
+            return self._distance_at(i)
+
+        return None
+
+    def solve(self, state):
+        """
+        Greedy descent towards a winning state
+        :param state: Packed state
+        :return: List of (vehicle index, signed delta) slides, or `None` if the state isn't indexed
+        """
+        distance = self.distance(state)
+        if distance is None:
+            return None
+
+        moves = []
+        while distance > 0:
+            for move, nxt in self.bitboard.successors(state, self.slides):
+                if self.distance(nxt) == distance - 1:
+                    moves.append(move)
+                    state = nxt
+                    distance -= 1
+                    break
+
+        return moves
+
+    def hardest(self):
+        """
+        :return: (distance, list of states) of the cluster's hardest configurations
+        """
+        max_distance = -1
+        states = []
+        for i in range(self._count):
+            distance = self._distance_at(i)
+            if distance > max_distance:
+                max_distance, states = distance, []
+            if distance == max_distance:
+                states.append(self[i])
+
+        return max_distance, states
+
+    def close(self):
+        self._mm.close()
+
+
+def main():
+    challenge_path = sys.argv[1]
+    if len(sys.argv) > 2:
+        index_path = sys.argv[2]
+    else:
+        os.makedirs(INDEX_DIR, exist_ok=True)
+        index_path = os.path.join(INDEX_DIR, os.path.splitext(os.path.basename(challenge_path))[0] + '.idx')
+
+    board = load_layout(challenge_path)
+    bitboard = Bitboard(board, red_car_index(board), CELLS)
+    distances = explore(bitboard)
+    write_index(index_path, bitboard, distances)
+
+    index = DifficultyIndex(index_path, bitboard)
+    max_distance, hardest = index.hardest()
+    print(f"Solvable states: {len(index)}, written to {index_path}")
+    print(f"Challenge distance: {index.distance(bitboard.initial)}")
+    print(f"Hardest distance: {max_distance} ({len(hardest)} states), e.g. vehicle anchors:")
+    print(bitboard.decode(hardest[0]))
+    print(f"Greedy solution length: {len(to_instructions(index.solve(hardest[0]), bitboard))}")
+
+
+if __name__ == '__main__':
+    main()
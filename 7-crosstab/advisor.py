@@ -0,0 +1,160 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 7:   query advisor
+#                   ----------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Helps SQLite run the generated crosstab queries on big copies of the schema:
+#   - Counts table rows, so that `JoinGraph` can start joining from the
+#     largest table and only look the smaller ones up by key
+#   - Suggests (or creates) an index for every join key that isn't already
+#     the leading column of an index or the rowid. Each index also carries the
+#     table's other join keys, so joining through a link table (e.g.
+#     InvoiceLine between Invoice and Track) reads the index alone
+#   - Formats EXPLAIN QUERY PLAN output as an indented report, so full scans
+#     ("SCAN ...") stand out from index lookups ("SEARCH ...")
+#
+# Usage: python advisor.py [database path] [--create]
+#        prints the suggested indexes (or creates them with --create) and the
+#        plans of the test crosstabs, joined in order of cardinality
+
+import sqlite3
+import sys
+
+
+DB_PATH = "Chinook_Sqlite.sqlite"
+
+
+def table_cardinalities(connection, tables):
+    """
+    :param connection: sqlite3 connection
+    :param tables: Iterable of table names
+    :return: Dict mapping each table to its number of rows
+    """
+    return {table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+
+
+def _rowid_column(connection, table):
+    """
+    :return: Name of the column aliasing `table`'s rowid (an INTEGER PRIMARY KEY), or `None`
+    """
+    table_info = connection.execute(f"PRAGMA table_info({table})").fetchall()
+    primary_key = [(name, col_type) for _, name, col_type, _, _, pk in table_info if pk]
+    if len(primary_key) == 1 and primary_key[0][1].upper() == 'INTEGER':
+        return primary_key[0][0]
+
+    return None
+
+
+def _leading_columns(connection, table):
+    """
+    :return: Set of columns that lead an index of `table`
+    """
+    columns = set()
+    for index in connection.execute(f"PRAGMA index_list({table})").fetchall():
+        index_columns = connection.execute(f"PRAGMA index_info({index[1]})").fetchall()
+        if index_columns:
+            columns.add(min(index_columns)[2])
+
+    return columns
+
+
+def unique_columns(connection, table):
+    """
+    :return: Set of columns of `table` whose values are unique (its rowid alias and single-column unique indexes)
+    """
+    columns = set()
+    rowid = _rowid_column(connection, table)
+    if rowid is not None:
+        columns.add(rowid)
+
+    for _, index_name, unique, _, _ in connection.execute(f"PRAGMA index_list({table})").fetchall():
+        index_columns = connection.execute(f"PRAGMA index_info({index_name})").fetchall()
+        if unique and len(index_columns) == 1:
+            columns.add(index_columns[0][2])
+
+    return columns
+
+
+def index_suggestions(connection, table_relations):
+    """
+    :param connection: sqlite3 connection
+    :param table_relations: `JoinGraph` of the database
+    :return: List of CREATE INDEX statements for join keys lacking an index
+    """
+    statements = []
+    for table, relations in table_relations.relations.items():
+        join_columns = list(dict.fromkeys(column for _, column, _ in relations))
+        rowid = _rowid_column(connection, table)
+        indexed = _leading_columns(connection, table)
+        for column in join_columns:
+            if column == rowid or column in indexed:
+                continue
+
+            # Every index entry holds the rowid already
+            index_columns = [column] + [other for other in join_columns if other not in (column, rowid)]
+            statements.append(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} "
+                              f"ON {table} ({', '.join(index_columns)})")
+
+    return statements
+
+
+def create_indexes(connection, table_relations):
+    """
+    Creates the suggested indexes, and gathers statistics for SQLite's planner
+    :return: List of the CREATE INDEX statements executed
+    """
+    statements = index_suggestions(connection, table_relations)
+    for statement in statements:
+        connection.execute(statement)
+
+    connection.execute("ANALYZE")
+    connection.commit()
+    return statements
+
+
+def explain(connection, query):
+    """
+    :param connection: sqlite3 connection
+    :param query: SQL query
+    :return: EXPLAIN QUERY PLAN report, one indented line per plan step
+    """
+    depths = {0: -1}
+    lines = []
+    for node_id, parent_id, _, detail in connection.execute(f"EXPLAIN QUERY PLAN {query}").fetchall():
+        depths[node_id] = depths.get(parent_id, -1) + 1
+        lines.append("  " * depths[node_id] + detail)
+
+    return "\n".join(lines)
+
+
+def main():
+    from main import construct_query, load_relations
+
+    args = [arg for arg in sys.argv[1:] if arg != '--create']
+    connection = sqlite3.connect(args[0] if args else DB_PATH)
+    table_relations = load_relations()
+    if '--create' in sys.argv:
+        statements = create_indexes(connection, table_relations)
+        print("Created indexes:" if statements else "No indexes missing")
+    else:
+        statements = index_suggestions(connection, table_relations)
+        print("Suggested indexes:" if statements else "No indexes missing")
+
+    for statement in statements:
+        print(f"  {statement}")
+
+    table_relations.cardinalities = table_cardinalities(connection, table_relations.relations)
+    for crosstab in (("Playlist.Name", "Genre.Name", "Track.TrackId", "COUNT"),
+                     ("Genre.Name", "MediaType.Name", "Track.UnitPrice", "AVG"),
+                     ("Customer.Country", "Genre.Name", "Track.TrackId", "COUNT")):
+        query = construct_query(*crosstab, table_relations)
+        print()
+        print(query)
+        print(explain(connection, query))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 7:   crosstab execution
+#                   ---------------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Runs crosstab queries against an SQLite database file and pivots their
+# results into {category 1: {category 2: value}} dicts, for constant-time
+# cell lookups. Rows are streamed in batches rather than fetched all at once,
+# and pivots are cached per crosstab until the database file is modified.
+#
+# Many crosstabs can be requested at once, in which case they're grouped into
+# batches that join their tables only once: the batch's tables are joined
+# along the union of the crosstabs' join trees, and each crosstab aggregates
+# its own columns out of that (as a UNION ALL over a shared, materialized CTE,
+# or over a temp table). Joining more tables than a crosstab needs mustn't
+# change its rows, so crosstabs only share a batch if they have a table in
+# common to start joining from, and every extra table is attached to them by
+# a unique key (LEFT JOINed, so at most one row matches and none is dropped).
+
+import os
+import sqlite3
+
+from advisor import unique_columns
+
+
+FETCH_SIZE = 10000  # Rows fetched from SQLite at a time
+
+
+class Crosstabs:
+    """
+    Cached crosstabs over a single database file
+    """
+    def __init__(self, db_path, build_query, table_relations=None):
+        """
+        :param db_path: SQLite database file path
+        :param build_query: Callable taking (col1, col2, aggcol, agg) and returning the crosstab SQL query,
+                            selecting (category 1, category 2, value) rows
+        :param table_relations: `JoinGraph` of the database, needed for batching crosstabs
+        """
+        self.db_path = db_path
+        self.build_query = build_query
+        self.table_relations = table_relations
+        self.connection = sqlite3.connect(db_path)
+        # Per (col1, col2, aggcol, agg), (database modification time, pivot)
+        self._cache = {}
+        # Per table, set of its unique columns
+        self._unique_columns = {}
+
+    def _modified(self):
+        return os.stat(self.db_path).st_mtime_ns
+
+    def crosstab(self, col1, col2, aggcol, agg):
+        """
+        :param col1: "TableName.ColumnName" of the first category column
+        :param col2: "TableName.ColumnName" of the second category column
+        :param aggcol: "TableName.ColumnName" of the value column
+        :param agg: SQL aggregation function
+        :return: Dict mapping each first category to a dict mapping second categories to aggregated values
+        """
+        key = (col1, col2, aggcol, agg)
+        modified = self._modified()
+        if self._is_cached(key, modified):
+            return self._cache[key][1]
+
+        pivot = {}
+        cursor = self.connection.execute(self.build_query(col1, col2, aggcol, agg))
+        while rows := cursor.fetchmany(FETCH_SIZE):
+            for category1, category2, value in rows:
+                pivot.setdefault(category1, {})[category2] = value
+
+        self._cache[key] = (modified, pivot)
+        return pivot
+
+    def _is_cached(self, key, modified):
+        return key in self._cache and self._cache[key][0] == modified
+
+    def _plan_batch(self, requests):
+        """
+        :param requests: List of (col1, col2, aggcol, agg) crosstabs
+        :return: Table to start joining from, list of (table, column, joined_table, joined_column, left) joins,
+                 and the set of tables each crosstab needs, or `None` if the crosstabs can't share their joins
+        """
+        trees = [self.table_relations.join_tree([col.split(".")[0] for col in request[:3]]) for request in requests]
+        common = set.intersection(*(set(tree) for tree in trees))
+        if not common:
+            return None
+
+        union = self.table_relations.join_tree(set().union(*trees))
+        if any(neighbor not in union.get(table, {}) for tree in trees for table in tree for neighbor in tree[table]):
+            return None
+
+        cardinalities = self.table_relations.cardinalities or {}
+        root = max(sorted(common), key=lambda table: cardinalities.get(table, 0))
+        joins = []
+        seen = {root}
+        frontier = [root]
+        while frontier:
+            joined_table = frontier.pop(0)
+            for table, (joined_column, column) in union[joined_table].items():
+                if table in seen:
+                    continue
+
+                # Tables some crosstab doesn't need must be looked up by a unique key
+                extra = any(table not in tree for tree in trees)
+                if extra:
+                    if table not in self._unique_columns:
+                        self._unique_columns[table] = unique_columns(self.connection, table)
+                    if column not in self._unique_columns[table]:
+                        return None
+
+                seen.add(table)
+                joins.append((table, column, joined_table, joined_column, extra))
+                frontier.append(table)
+
+        return root, joins, [set(tree) for tree in trees]
+
+    def _run_batch(self, requests, plan, temp_table=False):
+        """
+        :return: List of pivots, one per crosstab
+        """
+        root, joins, needed_tables = plan
+        columns = dict.fromkeys(col for request in requests for col in request[:3])
+        aliases = {col: f"c{idx}" for idx, col in enumerate(columns)}
+        # A LEFT JOINed table's join column is NULL exactly when no row of it matched
+        markers = {table: (f"m{idx}", column) for idx, (table, column, _, _, left) in enumerate(joins) if left}
+        selected = [f"{col} AS {alias}" for col, alias in aliases.items()]
+        selected += [f"{table}.{column} AS {marker}" for table, (marker, column) in markers.items()]
+        base = f"SELECT {', '.join(selected)} FROM {root}" + "".join(
+            f" {'LEFT JOIN' if left else 'JOIN'} {table} ON {table}.{column} = {joined_table}.{joined_column}"
+            for table, column, joined_table, joined_column, left in joins
+        )
+
+        base_name = "crosstab_base"
+        queries = []
+        for idx, ((col1, col2, aggcol, agg), tables) in enumerate(zip(requests, needed_tables)):
+            conditions = [f"{marker} IS NOT NULL" for table, (marker, _) in markers.items() if table in tables]
+            queries.append(
+                f"SELECT {idx}, {aliases[col1]}, {aliases[col2]}, {agg}({aliases[aggcol]}) FROM {base_name}"
+                + (f" WHERE {' AND '.join(conditions)}" if conditions else "")
+                + f" GROUP BY {aliases[col1]}, {aliases[col2]}"
+            )
+
+        pivots = [{} for _ in requests]
+        if temp_table:
+            self.connection.execute(f"CREATE TEMP TABLE {base_name} AS {base}")
+            try:
+                for query in queries:
+                    self._pivot_rows(self.connection.execute(query), pivots)
+            finally:
+                self.connection.execute(f"DROP TABLE temp.{base_name}")
+        else:
+            query = f"WITH {base_name} AS MATERIALIZED ({base}) " + " UNION ALL ".join(queries)
+            self._pivot_rows(self.connection.execute(query), pivots)
+
+        return pivots
+
+    @staticmethod
+    def _pivot_rows(cursor, pivots):
+        while rows := cursor.fetchmany(FETCH_SIZE):
+            for idx, category1, category2, value in rows:
+                pivots[idx].setdefault(category1, {})[category2] = value
+
+    def crosstabs(self, requests, temp_table=False):
+        """
+        Many crosstabs at once, sharing joins between them where possible
+        :param requests: Iterable of (col1, col2, aggcol, agg) crosstabs, see `crosstab`
+        :param temp_table: Whether to materialize each batch's joins in a temp table rather than a CTE
+        :return: List of pivots, one per crosstab (see `crosstab`)
+        """
+        if self.table_relations is None:
+            raise ValueError("Batching crosstabs needs the database's JoinGraph, pass it as table_relations")
+
+        requests = [tuple(request) for request in requests]
+        modified = self._modified()
+        # Group crosstabs that aren't cached yet into batches, each with its join plan
+        batches = []
+        for request in dict.fromkeys(requests):
+            if self._is_cached(request, modified):
+                continue
+
+            for batch in batches:
+                plan = self._plan_batch(batch[0] + [request])
+                if plan is not None:
+                    batch[0].append(request)
+                    batch[1] = plan
+                    break
+            else:
+                batches.append([[request], None])
+
+        for batch_requests, plan in batches:
+            if plan is None:
+                self.crosstab(*batch_requests[0])
+                continue
+
+            for request, pivot in zip(batch_requests, self._run_batch(batch_requests, plan, temp_table)):
+                self._cache[request] = (modified, pivot)
+
+        return [self._cache[request][1] for request in requests]
+
+    def clear(self):
+        """
+        Drops all cached pivots
+        """
+        self._cache.clear()
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,181 @@
+##############################################################################
+#
+#                   BFS zero-to-hero part 7:   join planner
+#                   ---------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Plans how to join any set of tables through the relation graph:
+#   - A BFS from every table, done once up front, gives all-pairs shortest
+#     join paths and distances
+#   - The join tree for a set of tables is a minimal Steiner tree: the union
+#     of shortest paths over a minimum spanning tree of the tables, plus some
+#     "Steiner" tables where paths should branch off. Every choice of up to
+#     `MAX_STEINER_POINTS` branching tables is tried (which is exact for up to
+#     4 tables), pruning tables that end up as unneeded leaves
+#   - Join trees are memoized per set of tables, so repeated queries over the
+#     same tables never search again
+#   - Once table cardinalities are known (see advisor.py), joining starts from
+#     the largest table of the tree, so that it's scanned once while the
+#     smaller tables are looked up by key
+
+import os
+import sys
+from collections import deque
+from itertools import combinations
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from bfslib import bfs_tree, reconstruct_path
+
+
+# Most branching tables tried per join tree (an optimal tree over k tables never needs more than k - 2)
+MAX_STEINER_POINTS = 2
+
+
+class JoinGraph:
+    """
+    Relation graph between tables, with precomputed shortest join paths
+    """
+    def __init__(self, table_relations):
+        """
+        :param table_relations: Dict mapping each table name to a list of (neighbor_table, column, neighbor_column)
+                                join keys
+        """
+        self.relations = table_relations
+        # Per table, BFS parents (see `bfslib.reconstruct_path`) of the shortest join paths from it,
+        # with moves being (table, column, neighbor_table, neighbor_column) joins
+        self.path_trees = {table: bfs_tree(table, self._neighbors) for table in table_relations}
+        self.distances = {
+            (table, other): len(reconstruct_path(parents, other))
+            for table, parents in self.path_trees.items() for other in parents
+        }
+        self._join_trees = {}
+        # Optional dict mapping table names to their number of rows
+        self.cardinalities = None
+
+    def _neighbors(self, table):
+        for neighbor, column, neighbor_column in self.relations.get(table, []):
+            yield (table, column, neighbor, neighbor_column), neighbor
+
+    def path(self, table, other):
+        """
+        :return: List of (table, column, neighbor_table, neighbor_column) joins leading from `table` to `other`,
+                 or `None` if they aren't connected
+        """
+        if table == other:
+            return []
+        if (table, other) not in self.distances:
+            return None
+
+        return [join for join, _ in reconstruct_path(self.path_trees[table], other)]
+
+    def _spanning_tree(self, tables):
+        """
+        Union of the shortest paths along a minimum spanning tree (by join distance) of `tables`
+        :return: Dict mapping each table of the tree to a dict of {neighbor table: (column, neighbor_column)},
+                 or `None` if the tables aren't connected
+        """
+        # Prim's algorithm over the metric closure
+        in_tree = {tables[0]}
+        paths = []
+        while len(in_tree) < len(tables):
+            candidates = [
+                (self.distances[(table, other)], table, other)
+                for table in in_tree for other in tables
+                if other not in in_tree and (table, other) in self.distances
+            ]
+            if not candidates:
+                return None
+
+            _, table, other = min(candidates)
+            in_tree.add(other)
+            paths.append(self.path(table, other))
+
+        union = {tables[0]: {}}
+        for path in paths:
+            for table, column, neighbor, neighbor_column in path:
+                union.setdefault(table, {})[neighbor] = (column, neighbor_column)
+                union.setdefault(neighbor, {})[table] = (neighbor_column, column)
+
+        # Overlapping paths may close cycles, keep a BFS spanning tree of their union
+        tree = {tables[0]: {}}
+        frontier = deque([tables[0]])
+        while frontier:
+            table = frontier.popleft()
+            for neighbor, (column, neighbor_column) in union[table].items():
+                if neighbor not in tree:
+                    tree[table][neighbor] = (column, neighbor_column)
+                    tree[neighbor] = {table: (neighbor_column, column)}
+                    frontier.append(neighbor)
+
+        return tree
+
+    @staticmethod
+    def _prune(tree, tables):
+        """
+        Removes leaves that aren't among `tables`, in place
+        """
+        leaves = [table for table, neighbors in tree.items() if len(neighbors) <= 1 and table not in tables]
+        while leaves:
+            leaf = leaves.pop()
+            for neighbor in tree.pop(leaf):
+                del tree[neighbor][leaf]
+                if len(tree[neighbor]) <= 1 and neighbor not in tables:
+                    leaves.append(neighbor)
+
+    def join_tree(self, tables):
+        """
+        Minimal join tree connecting `tables`, memoized per set of tables
+        :param tables: Iterable of table names
+        :return: Dict mapping each table of the tree to a dict of {neighbor table: (column, neighbor_column)}
+        """
+        key = frozenset(tables)
+        if key not in self._join_trees:
+            terminals = sorted(key)
+            branching = [
+                table for table, relations in self.relations.items()
+                if len(relations) >= 3 and table not in key
+            ]
+            best = None
+            for n_points in range(max(min(len(terminals) - 2, MAX_STEINER_POINTS), 0) + 1):
+                for points in combinations(branching, n_points):
+                    tree = self._spanning_tree(terminals + list(points))
+                    if tree is None:
+                        continue
+
+                    self._prune(tree, key)
+                    if best is None or len(tree) < len(best):
+                        best = tree
+
+            if best is None:
+                raise ValueError(f"Tables {terminals} can't be joined")
+
+            self._join_trees[key] = best
+
+        return self._join_trees[key]
+
+    def joins(self, tables):
+        """
+        :param tables: Sequence of table names
+        :return: Table to start joining from (the largest one of the tree if cardinalities are known,
+                 otherwise the first of `tables`), and a list of (table, column, joined_table, joined_column)
+                 steps, each joining `table` to an already joined `joined_table`
+        """
+        tree = self.join_tree(tables)
+        root = tables[0]
+        if self.cardinalities is not None:
+            root = max(tree, key=lambda table: self.cardinalities.get(table, 0))
+
+        steps = []
+        frontier = deque([root])
+        seen = {root}
+        while frontier:
+            joined_table = frontier.popleft()
+            for table, (joined_column, column) in tree[joined_table].items():
+                if table not in seen:
+                    seen.add(table)
+                    steps.append((table, column, joined_table, joined_column))
+                    frontier.append(table)
+
+        return root, steps
@@ -0,0 +1,7 @@
+"""
+Shared search engine used by the BFS zero-to-hero challenges
+"""
+from .core import bfs, bfs_distances, bfs_tree, bidirectional_bfs, reconstruct_path
+from .external import external_bfs
+from .informed import a_star, ida_star
+from .parallel import parallel_bfs
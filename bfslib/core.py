@@ -0,0 +1,206 @@
+##############################################################################
+#
+#                   BFS zero-to-hero:   shared search engine
+#                   ----------------------------------------
+#
+##############################################################################
+##############################################################################
+
+from collections import deque
+
+
+def reconstruct_path(parents, key):
+    """
+    Walk parent pointers back from `key` to the search root
+    :param parents: Dict mapping state key to (parent key, move, state) triplets, root maps to (None, None, state)
+    :param key: Key of the state the path should end in
+    :return: List of (move, state) steps from the root to `key` (root itself excluded)
+    """
+    steps = []
+    parent_key, move, state = parents[key]
+    while parent_key is not None:
+        steps.append((move, state))
+        parent_key, move, state = parents[parent_key]
+
+    steps.reverse()
+    return steps
+
+
+def bfs(start, neighbors, is_goal, key=None):
+    """
+    Breadth-first search from `start` until a goal state is generated.
+    States are goal-tested as soon as they're generated, which saves expanding a whole layer.
+    :param start: Initial state
+    :param neighbors: Callable returning an iterable of (move, next_state) pairs for a state
+    :param is_goal: Callable returning True if a state is a goal
+    :param key: Optional callable mapping a state to a hashable key, defaults to the state itself
+    :return: List of (move, state) steps from `start` to the goal (empty if `start` is a goal),
+             or `None` if no goal is reachable
+    """
+    if key is None:
+        key = _identity
+
+    start_key = key(start)
+    if is_goal(start):
+        return []
+
+    parents = {start_key: (None, None, start)}
+    frontier = deque([(start_key, start)])
+    while frontier:
+        curr_key, curr = frontier.popleft()
+        for move, nxt in neighbors(curr):
+            nxt_key = key(nxt)
+            if nxt_key in parents:
+                continue
+
+            parents[nxt_key] = (curr_key, move, nxt)
+            if is_goal(nxt):
+                return reconstruct_path(parents, nxt_key)
+
+            frontier.append((nxt_key, nxt))
+
+    return None
+
+
+def bfs_tree(start, neighbors, key=None):
+    """
+    Exhaustive breadth-first search from `start`, keeping the shortest-path tree so that paths to any number
+    of reachable states can be read off it with `reconstruct_path`
+    :param start: Initial state
+    :param neighbors: Callable returning an iterable of (move, next_state) pairs for a state
+    :param key: Optional callable mapping a state to a hashable key, defaults to the state itself
+    :return: Parents dict (see `reconstruct_path`) of every reachable state, in nondecreasing order of distance
+    """
+    if key is None:
+        key = _identity
+
+    parents = {key(start): (None, None, start)}
+    frontier = deque([(key(start), start)])
+    while frontier:
+        curr_key, curr = frontier.popleft()
+        for move, nxt in neighbors(curr):
+            nxt_key = key(nxt)
+            if nxt_key not in parents:
+                parents[nxt_key] = (curr_key, move, nxt)
+                frontier.append((nxt_key, nxt))
+
+    return parents
+
+
+def bfs_distances(sources, neighbors, key=None):
+    """
+    Exhaustive multi-source breadth-first search, e.g. for enumerating a connected state space
+    or computing distances to a set of goals (by expanding predecessors)
+    :param sources: Iterable of states at distance 0
+    :param neighbors: Callable returning an iterable of (move, next_state) pairs for a state
+    :param key: Optional callable mapping a state to a hashable key, defaults to the state itself
+    :return: Dict mapping the key of every reachable state to its distance from the nearest source
+    """
+    if key is None:
+        key = _identity
+
+    distances = {}
+    layer = []
+    for source in sources:
+        source_key = key(source)
+        if source_key not in distances:
+            distances[source_key] = 0
+            layer.append(source)
+
+    distance = 0
+    while layer:
+        distance += 1
+        next_layer = []
+        for curr in layer:
+            for _, nxt in neighbors(curr):
+                nxt_key = key(nxt)
+                if nxt_key not in distances:
+                    distances[nxt_key] = distance
+                    next_layer.append(nxt)
+
+        layer = next_layer
+
+    return distances
+
+
+def bidirectional_bfs(start, goals, neighbors, predecessors, key=None):
+    """
+    Breadth-first search expanding from `start` and from all `goals` simultaneously, meeting in the middle.
+    Each round expands a whole layer of the smaller frontier, so a depth-d search visits about 2 * b^(d/2)
+    states instead of b^d.
+    :param start: Initial state
+    :param goals: Iterable of goal states
+    :param neighbors: Callable returning an iterable of (move, next_state) pairs for a state
+    :param predecessors: Callable returning an iterable of (move, prev_state) pairs for a state,
+                         such that applying `move` to `prev_state` yields the state
+    :param key: Optional callable mapping a state to a hashable key, defaults to the state itself
+    :return: List of (move, state) steps from `start` to a goal (empty if `start` is a goal),
+             or `None` if no goal is reachable
+    """
+    if key is None:
+        key = _identity
+
+    start_key = key(start)
+    fwd_parents = {start_key: (None, None, start)}
+    fwd_depth = {start_key: 0}
+    bwd_parents = {}
+    bwd_depth = {}
+    for goal in goals:
+        goal_key = key(goal)
+        bwd_parents[goal_key] = (None, None, goal)
+        bwd_depth[goal_key] = 0
+
+    if start_key in bwd_parents:
+        return []
+
+    fwd_frontier = [start_key]
+    bwd_frontier = list(bwd_parents)
+    while fwd_frontier and bwd_frontier:
+        if len(fwd_frontier) <= len(bwd_frontier):
+            fwd_frontier, meet_key = _expand_layer(fwd_frontier, fwd_parents, fwd_depth, bwd_depth,
+                                                   neighbors, key)
+        else:
+            bwd_frontier, meet_key = _expand_layer(bwd_frontier, bwd_parents, bwd_depth, fwd_depth,
+                                                   predecessors, key)
+
+        if meet_key is not None:
+            steps = reconstruct_path(fwd_parents, meet_key)
+            child_key, move, _ = bwd_parents[meet_key]
+            while child_key is not None:
+                steps.append((move, bwd_parents[child_key][2]))
+                child_key, move, _ = bwd_parents[child_key]
+
+            return steps
+
+    return None
+
+
+def _expand_layer(frontier, parents, depth, other_depth, expand, key):
+    """
+    Expand a whole BFS layer for one side of a bidirectional search
+    :return: (next frontier, key of the best meeting state or `None`)
+    """
+    next_frontier = []
+    meet_key = None
+    meet_length = None
+    for curr_key in frontier:
+        curr_depth = depth[curr_key] + 1
+        for move, nxt in expand(parents[curr_key][2]):
+            nxt_key = key(nxt)
+            if nxt_key in parents:
+                continue
+
+            parents[nxt_key] = (curr_key, move, nxt)
+            depth[nxt_key] = curr_depth
+            if nxt_key in other_depth:
+                length = curr_depth + other_depth[nxt_key]
+                if meet_length is None or length < meet_length:
+                    meet_key, meet_length = nxt_key, length
+            else:
+                next_frontier.append(nxt_key)
+
+    return next_frontier, meet_key
+
+
+def _identity(x):
+    return x
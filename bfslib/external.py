@@ -0,0 +1,211 @@
+##############################################################################
+#
+#                   BFS zero-to-hero:   external-memory search
+#                   ------------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Breadth-first search with the frontier and visited states kept on disk, for
+# state spaces that outgrow memory long before they outgrow disk. States must
+# be ints (packed boards), stored as fixed-width big-endian bytes so that they
+# sort the same as numbers:
+#   - Expanding a layer streams its file, collecting successors as (state,
+#     parent, move index) records in a buffer. Whenever the buffer fills up it
+#     is sorted and written out as a run file
+#   - Duplicates are detected with a delay, all at once per layer: the runs
+#     are merged, and the merge is streamed against the sorted file of all
+#     states visited so far. States seen for the first time make up the next
+#     layer's file, and are merged into a new visited file along the way
+#   - Every layer file keeps its states' parents and moves, sorted by state,
+#     so a path is reconstructed by binary searching one file per layer
+#
+# Memory use is bounded by the buffer size, plus one read block per file being
+# merged (runs are merged in rounds, at most `MAX_RUNS` at a time).
+
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from itertools import islice
+
+
+# Successor records sorted in memory at a time
+BUFFER_SIZE = 10 ** 6
+# Most files merged at once
+MAX_RUNS = 64
+# Records read from a file at a time
+READ_RECORDS = 4096
+
+
+def _read(path, record):
+    """
+    :return: Generator of the unpacked records of a file
+    """
+    with open(path, 'rb') as f:
+        while block := f.read(record.size * READ_RECORDS):
+            yield from record.iter_unpack(block)
+
+
+def _write_run(path, records, record):
+    records.sort()
+    with open(path, 'wb') as f:
+        f.write(b''.join(record.pack(*fields) for fields in records))
+
+
+def _merge_runs(paths, record, directory):
+    """
+    Merges sorted runs in rounds until few enough are left to merge them all at once, deleting merged runs
+    :return: List of paths of the remaining runs
+    """
+    while len(paths) > MAX_RUNS:
+        merged = []
+        for i in range(0, len(paths), MAX_RUNS):
+            group = paths[i:i + MAX_RUNS]
+            fd, path = tempfile.mkstemp(dir=directory, suffix='.run')
+            with os.fdopen(fd, 'wb') as f:
+                for fields in heapq.merge(*(_read(run, record) for run in group)):
+                    f.write(record.pack(*fields))
+
+            for run in group:
+                os.remove(run)
+            merged.append(path)
+
+        paths = merged
+
+    return paths
+
+
+def _expand(layer_path, neighbors, record, width, directory, buffer_size):
+    """
+    Expands a layer into sorted run files of successor records
+    :return: List of run file paths
+    """
+    runs = []
+    buffer = []
+    for state, _, _ in _read(layer_path, record):
+        for move_idx, (_, nxt) in enumerate(neighbors(int.from_bytes(state, 'big'))):
+            buffer.append((nxt.to_bytes(width, 'big'), state, move_idx))
+            if len(buffer) >= buffer_size:
+                runs.append(os.path.join(directory, f'run{len(runs)}'))
+                _write_run(runs[-1], buffer, record)
+                buffer = []
+
+    if buffer:
+        runs.append(os.path.join(directory, f'run{len(runs)}'))
+        _write_run(runs[-1], buffer, record)
+
+    return _merge_runs(runs, record, directory)
+
+
+def _deduplicate(runs, visited_path, layer_path, new_visited_path, record, state_struct, is_goal):
+    """
+    Streams the merged runs against the visited states, writing the states seen for the first time as the next
+    layer, and all of them as the new visited states. Stops early once a goal is written to the layer.
+    :return: (number of new states, goal state bytes or `None`)
+    """
+    visited = (state for state, in _read(visited_path, state_struct))
+    curr_visited = next(visited, None)
+    n_new = 0
+    prev = None
+    with open(layer_path, 'wb') as layer, open(new_visited_path, 'wb') as new_visited:
+        for state, parent, move_idx in heapq.merge(*(_read(run, record) for run in runs)):
+            if state == prev:
+                continue
+
+            prev = state
+            while curr_visited is not None and curr_visited < state:
+                new_visited.write(curr_visited)
+                curr_visited = next(visited, None)
+            if curr_visited == state:
+                continue
+
+            layer.write(record.pack(state, parent, move_idx))
+            new_visited.write(state)
+            n_new += 1
+            if is_goal(int.from_bytes(state, 'big')):
+                return n_new, state
+
+        while curr_visited is not None:
+            new_visited.write(curr_visited)
+            curr_visited = next(visited, None)
+
+    return n_new, None
+
+
+def _find(path, record, state):
+    """
+    Binary searches a layer file for a state
+    :return: (state, parent, move index) record
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lo, hi = 0, len(mm) // record.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if mm[mid * record.size:mid * record.size + len(state)] < state:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return record.unpack_from(mm, lo * record.size)
+
+
+def external_bfs(start, neighbors, is_goal, width, directory=None, buffer_size=BUFFER_SIZE):
+    """
+    Breadth-first search from `start` until a goal state is found, keeping layers and visited states in files.
+    Goals are detected a layer at a time, so the path found may differ from `bfs`'s (it's as short).
+    :param start: Initial state, an int
+    :param neighbors: Callable returning an iterable of (move, next_state) pairs for a state
+    :param is_goal: Callable returning True if a state is a goal
+    :param width: Number of bytes that fit any state
+    :param directory: Directory to create the (temporary) search files in, defaults to the system's
+    :param buffer_size: Number of successor records sorted in memory at a time
+    :return: List of (move, state) steps from `start` to the goal (empty if `start` is a goal),
+             or `None` if no goal is reachable
+    """
+    if is_goal(start):
+        return []
+
+    # State, parent, index of the move among the parent's neighbors
+    record = struct.Struct(f'>{width}s{width}sH')
+    state_struct = struct.Struct(f'>{width}s')
+    with tempfile.TemporaryDirectory(dir=directory) as tmp_dir:
+        start_bytes = start.to_bytes(width, 'big')
+        layer_paths = [os.path.join(tmp_dir, 'layer0')]
+        with open(layer_paths[0], 'wb') as f:
+            f.write(record.pack(start_bytes, start_bytes, 0))
+        visited_path = os.path.join(tmp_dir, 'visited0')
+        with open(visited_path, 'wb') as f:
+            f.write(start_bytes)
+
+        goal = None
+        n_new = 1
+        while goal is None and n_new > 0:
+            depth = len(layer_paths)
+            run_dir = os.path.join(tmp_dir, f'runs{depth}')
+            os.mkdir(run_dir)
+            runs = _expand(layer_paths[-1], neighbors, record, width, run_dir, buffer_size)
+            layer_paths.append(os.path.join(tmp_dir, f'layer{depth}'))
+            new_visited_path = os.path.join(tmp_dir, f'visited{depth}')
+            n_new, goal = _deduplicate(runs, visited_path, layer_paths[-1], new_visited_path, record,
+                                       state_struct, is_goal)
+            for run in runs:
+                os.remove(run)
+            os.rmdir(run_dir)
+            os.remove(visited_path)
+            visited_path = new_visited_path
+
+        if goal is None:
+            return None
+
+        steps = []
+        state = goal
+        for layer_path in reversed(layer_paths[1:]):
+            _, parent, move_idx = _find(layer_path, record, state)
+            move, _ = next(islice(neighbors(int.from_bytes(parent, 'big')), move_idx, None))
+            steps.append((move, int.from_bytes(state, 'big')))
+            state = parent
+
+        steps.reverse()
+        return steps
@@ -0,0 +1,101 @@
+##############################################################################
+#
+#                   BFS zero-to-hero:   vectorized grid search
+#                   ----------------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Layer-at-a-time BFS over 4-connected grids using NumPy, which is an optional
+# dependency. The grid is padded with a wall border and flattened, so the four
+# neighbors of cell i are simply i - width, i + width, i - 1 and i + 1. Each
+# layer is expanded as a whole: the frontier is an array of flat indices, its
+# neighbors are masked by the free-and-unvisited cells, and the survivors get
+# the layer number in an int32 distance array. Only frontier cells are touched,
+# so long winding mazes (thousands of thin layers) cost no more than open ones.
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+UNREACHED = -1
+
+
+def _padded(free):
+    if np is None:
+        raise ImportError("Vectorized grid search requires NumPy (pip install numpy)")
+
+    free = np.asarray(free, dtype=bool)
+    padded = np.zeros((free.shape[0] + 2, free.shape[1] + 2), dtype=bool)
+    padded[1:-1, 1:-1] = free
+    return padded
+
+
+def _flat_distances(padded, start_idx, end_idx=None):
+    width = padded.shape[1]
+    offsets = np.array([width, -width, 1, -1])
+    unvisited = padded.ravel().copy()
+    distances = np.full(unvisited.shape, UNREACHED, dtype=np.int32)
+    unvisited[start_idx] = False
+    distances[start_idx] = 0
+
+    frontier = np.array([start_idx])
+    layer = 0
+    while frontier.size and (end_idx is None or distances[end_idx] == UNREACHED):
+        layer += 1
+        candidates = (frontier[:, None] + offsets).ravel()
+        frontier = np.unique(candidates[unvisited[candidates]])
+        unvisited[frontier] = False
+        distances[frontier] = layer
+
+    return distances
+
+
+def grid_distances(free, start_pos, end_pos=None):
+    """
+    Breadth-first search from `start_pos`, one whole layer per step
+    :param free: 2D array-like of booleans, True denoting free cells
+    :param start_pos: (row, col) start position
+    :param end_pos: Optional (row, col) position at which to stop early
+    :return: int32 array of distances from `start_pos` (`UNREACHED` for cells not reached)
+    """
+    padded = _padded(free)
+    width = padded.shape[1]
+    end_idx = None if end_pos is None else (end_pos[0] + 1) * width + end_pos[1] + 1
+    distances = _flat_distances(padded, (start_pos[0] + 1) * width + start_pos[1] + 1, end_idx)
+    return distances.reshape(padded.shape)[1:-1, 1:-1]
+
+
+def grid_path(free, start_pos, end_pos):
+    """
+    Shortest path between two cells of a 4-connected grid
+    :param free: 2D array-like of booleans, True denoting free cells
+    :param start_pos: (row, col) start position
+    :param end_pos: (row, col) end position
+    :return: List of (row, col) tuples starting with `start_pos` and ending in `end_pos`,
+             or an empty list if `end_pos` is unreachable
+    """
+    padded = _padded(free)
+    width = padded.shape[1]
+    end_idx = (end_pos[0] + 1) * width + end_pos[1] + 1
+    distances = _flat_distances(padded, (start_pos[0] + 1) * width + start_pos[1] + 1, end_idx).tolist()
+    distance = distances[end_idx]
+    if distance == UNREACHED:
+        return []
+
+    # Walk back from the end, always stepping to a cell one layer closer to the start
+    idx = end_idx
+    path = [idx]
+    while distance > 0:
+        distance -= 1
+        for offset in (width, -width, 1, -1):
+            if distances[idx + offset] == distance:
+                idx += offset
+                break
+
+        path.append(idx)
+
+    path.reverse()
+    return [(idx // width - 1, idx % width - 1) for idx in path]
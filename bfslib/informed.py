@@ -0,0 +1,113 @@
+##############################################################################
+#
+#                   BFS zero-to-hero:   informed search
+#                   -------------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Unit-cost A* and IDA*, sharing the neighbors / is_goal callback shape of `bfs`.
+# With an admissible heuristic both return shortest paths, same length as BFS.
+
+from heapq import heappush, heappop
+from itertools import count
+
+from .core import reconstruct_path, _identity
+
+
+def a_star(start, neighbors, is_goal, heuristic, key=None):
+    """
+    A* search with unit move costs
+    :param start: Initial state
+    :param neighbors: Callable returning an iterable of (move, next_state) pairs for a state
+    :param is_goal: Callable returning True if a state is a goal
+    :param heuristic: Callable returning an admissible estimate of a state's distance to the goal
+    :param key: Optional callable mapping a state to a hashable key, defaults to the state itself
+    :return: List of (move, state) steps from `start` to the goal (empty if `start` is a goal),
+             or `None` if no goal is reachable
+    """
+    if key is None:
+        key = _identity
+
+    start_key = key(start)
+    parents = {start_key: (None, None, start)}
+    depth = {start_key: 0}
+    tie_breaker = count()
+    # Among equal f values prefer deeper states, they're closer to the goal
+    queue = [(heuristic(start), 0, next(tie_breaker), start_key)]
+    while queue:
+        _, neg_depth, _, curr_key = heappop(queue)
+        if -neg_depth != depth[curr_key]:
+            # Stale entry, the state has since been reached via a shorter path
+            continue
+
+        curr = parents[curr_key][2]
+        if is_goal(curr):
+            return reconstruct_path(parents, curr_key)
+
+        nxt_depth = 1 - neg_depth
+        for move, nxt in neighbors(curr):
+            nxt_key = key(nxt)
+            if nxt_key in depth and depth[nxt_key] <= nxt_depth:
+                continue
+
+            parents[nxt_key] = (curr_key, move, nxt)
+            depth[nxt_key] = nxt_depth
+            heappush(queue, (nxt_depth + heuristic(nxt), -nxt_depth, next(tie_breaker), nxt_key))
+
+    return None
+
+
+def ida_star(start, neighbors, is_goal, heuristic, key=None):
+    """
+    Iterative-deepening A* with unit move costs. Memory is linear in solution depth,
+    at the cost of re-expanding states across iterations.
+    :param start: Initial state
+    :param neighbors: Callable returning an iterable of (move, next_state) pairs for a state
+    :param is_goal: Callable returning True if a state is a goal
+    :param heuristic: Callable returning an admissible estimate of a state's distance to the goal
+    :param key: Optional callable mapping a state to a hashable key, defaults to the state itself
+    :return: List of (move, state) steps from `start` to the goal (empty if `start` is a goal),
+             or `None` if no goal is reachable
+    """
+    if key is None:
+        key = _identity
+
+    steps = []
+    on_path = {key(start)}
+
+    def search(curr, depth, bound):
+        # Returns None when a goal was found (left in `steps`), otherwise the smallest f exceeding `bound`
+        f = depth + heuristic(curr)
+        if f > bound:
+            return f
+        if is_goal(curr):
+            return None
+
+        next_bound = float('inf')
+        for move, nxt in neighbors(curr):
+            nxt_key = key(nxt)
+            if nxt_key in on_path:
+                continue
+
+            steps.append((move, nxt))
+            on_path.add(nxt_key)
+            result = search(nxt, depth + 1, bound)
+            if result is None:
+                return None
+
+            steps.pop()
+            on_path.remove(nxt_key)
+            next_bound = min(next_bound, result)
+
+        return next_bound
+
+    bound = heuristic(start)
+    while True:
+        result = search(start, 0, bound)
+        if result is None:
+            return steps
+        if result == float('inf'):
+            return None
+
+        bound = result
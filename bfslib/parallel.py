@@ -0,0 +1,213 @@
+##############################################################################
+#
+#                   BFS zero-to-hero:   parallel search
+#                   -----------------------------------
+#
+##############################################################################
+##############################################################################
+
+# Level-synchronous BFS over a team of worker processes, for state spaces big
+# enough that a single core is the bottleneck. States must be ints (packed
+# boards) so that they travel between processes as fixed-width binary records:
+#   - Every state is owned by one worker, picked by a multiplicative hash of
+#     the state (its low bits alone, e.g. a few board cells, would leave some
+#     workers idle), which keeps the visited states of its shard along with
+#     their parents
+#   - Each layer, every worker expands its slice of the frontier and sends the
+#     successors to their owners, one packed batch per owner. Owners drop the
+#     states visited before and keep a single proposal of each new one
+#   - To come up with the same paths as `bfs`, the kept proposal is the one
+#     `bfs` would generate first: the one with the lowest (parent rank, move
+#     index), a state's rank being its position in `bfs`'s queue within its
+#     layer. New states are then sent to the workers owning their parents'
+#     range of ranks and sorted, which makes for the next layer's slices, in
+#     rank order again
+
+import multiprocessing
+import os
+import struct
+from itertools import islice
+from multiprocessing.connection import wait
+
+
+# Fibonacci hashing multiplier (2^64 / golden ratio)
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+def _owner(state, n_workers):
+    """
+    :return: Index of the worker owning `state`'s shard
+    """
+    return ((state * HASH_MULTIPLIER) >> 64) % n_workers
+
+
+def _exchange(batches, inboxes, inbox):
+    """
+    Sends every worker its batch of records, and gathers the batches all workers sent to this one
+    :param batches: List of lists of packed records, per destination worker
+    :param inboxes: Queue of every worker, for this kind of records
+    :param inbox: This worker's queue
+    :return: List of the received batches, as bytes
+    """
+    for dest_inbox, records in zip(inboxes, batches):
+        dest_inbox.put(b''.join(records))
+
+    return [inbox.get() for _ in inboxes]
+
+
+def _worker(worker, start, neighbors, is_goal, width, control, proposal_inboxes, layer_inboxes):
+    """
+    Worker process loop, serving commands received over `control` (see `parallel_bfs`)
+    """
+    n_workers = len(proposal_inboxes)
+    # Proposed state, its parent, parent rank, index of the move among the parent's neighbors
+    proposal = struct.Struct(f'<{width}s{width}sQH')
+    # New state, its parent's rank and move index
+    member = struct.Struct(f'<{width}sQH')
+    # Per state of the shard (packed as bytes), (parent or `None`, move index)
+    parents = {}
+    if _owner(start, n_workers) == worker:
+        parents[start.to_bytes(width, 'little')] = (None, None)
+
+    frontier = [start] if worker == 0 else []
+    try:
+        while True:
+            command = control.recv()
+            if command[0] == 'parent':
+                control.send(parents[command[1].to_bytes(width, 'little')])
+                continue
+
+            _, offset, layer_size = command
+            batches = [[] for _ in range(n_workers)]
+            for rank, state in enumerate(frontier, offset):
+                state_bytes = state.to_bytes(width, 'little')
+                for move_idx, (_, nxt) in enumerate(neighbors(state)):
+                    batches[_owner(nxt, n_workers)].append(
+                        proposal.pack(nxt.to_bytes(width, 'little'), state_bytes, rank, move_idx)
+                    )
+
+            # Per new state of the shard, its first proposal as (parent rank, move index, parent)
+            new = {}
+            for batch in _exchange(batches, proposal_inboxes, proposal_inboxes[worker]):
+                for nxt, parent, rank, move_idx in proposal.iter_unpack(batch):
+                    if nxt in parents:
+                        continue
+
+                    first = new.get(nxt)
+                    if first is None or (rank, move_idx) < first[:2]:
+                        new[nxt] = (rank, move_idx, parent)
+
+            goal = None
+            batches = [[] for _ in range(n_workers)]
+            for nxt, (rank, move_idx, parent) in new.items():
+                parents[nxt] = (parent, move_idx)
+                batches[rank * n_workers // layer_size].append(member.pack(nxt, rank, move_idx))
+                if (goal is None or (rank, move_idx) < goal[:2]) and is_goal(int.from_bytes(nxt, 'little')):
+                    goal = (rank, move_idx, int.from_bytes(nxt, 'little'))
+
+            received = [
+                (rank, move_idx, nxt)
+                for batch in _exchange(batches, layer_inboxes, layer_inboxes[worker])
+                for nxt, rank, move_idx in member.iter_unpack(batch)
+            ]
+            received.sort()
+            frontier = [int.from_bytes(nxt, 'little') for _, _, nxt in received]
+            control.send((len(frontier), goal))
+    except Exception as e:
+        control.send(e)
+
+
+def _reply(control):
+    """
+    :return: Next reply of a worker, raising its exception if it failed
+    """
+    reply = control.recv()
+    if isinstance(reply, Exception):
+        raise reply
+
+    return reply
+
+
+def _request(control, command):
+    control.send(command)
+    return _reply(control)
+
+
+def _replies(controls):
+    """
+    Gathers a reply from every worker, in whatever order they come. A failed worker leaves the others stuck
+    waiting for its batches, so its exception is raised right away rather than after theirs.
+    :return: List of replies, in worker order
+    """
+    workers = {control: worker for worker, control in enumerate(controls)}
+    replies = [None] * len(controls)
+    while workers:
+        for control in wait(list(workers)):
+            replies[workers.pop(control)] = _reply(control)
+
+    return replies
+
+
+def parallel_bfs(start, neighbors, is_goal, width, processes=None):
+    """
+    Breadth-first search from `start` until a goal state is generated, spread over worker processes.
+    Finds the same path as `bfs`, as long as `neighbors` is deterministic.
+    :param start: Initial state, an int
+    :param neighbors: Callable returning an iterable of (move, next_state) pairs for a state (picklable, for
+                      platforms that spawn worker processes rather than fork them)
+    :param is_goal: Callable returning True if a state is a goal (picklable too)
+    :param width: Number of bytes that fit any state
+    :param processes: Number of worker processes, defaults to the number of CPUs
+    :return: List of (move, state) steps from `start` to the goal (empty if `start` is a goal),
+             or `None` if no goal is reachable
+    """
+    if is_goal(start):
+        return []
+
+    processes = processes or os.cpu_count()
+    proposal_inboxes = [multiprocessing.Queue() for _ in range(processes)]
+    layer_inboxes = [multiprocessing.Queue() for _ in range(processes)]
+    controls = []
+    workers = []
+    for worker in range(processes):
+        control, worker_control = multiprocessing.Pipe()
+        controls.append(control)
+        workers.append(multiprocessing.Process(
+            target=_worker, daemon=True,
+            args=(worker, start, neighbors, is_goal, width, worker_control, proposal_inboxes, layer_inboxes)
+        ))
+        workers[-1].start()
+
+    try:
+        sizes = [1] + [0] * (processes - 1)
+        goal = None
+        while goal is None and sum(sizes) > 0:
+            offset = 0
+            for control, size in zip(controls, sizes):
+                control.send(('layer', offset, sum(sizes)))
+                offset += size
+
+            replies = _replies(controls)
+            sizes = [size for size, _ in replies]
+            goal = min((goal for _, goal in replies if goal is not None), default=None)
+
+        if goal is None:
+            return None
+
+        steps = []
+        state = goal[2]
+        parent, move_idx = _request(controls[_owner(state, processes)], ('parent', state))
+        while parent is not None:
+            parent = int.from_bytes(parent, 'little')
+            move, _ = next(islice(neighbors(parent), move_idx, None))
+            steps.append((move, state))
+            state = parent
+            parent, move_idx = _request(controls[_owner(state, processes)], ('parent', state))
+
+        steps.reverse()
+        return steps
+    finally:
+        # Workers may be stuck waiting on a failed one, no point stopping them gracefully
+        for worker in workers:
+            worker.terminate()
+            worker.join()